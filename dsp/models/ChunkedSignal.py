@@ -0,0 +1,295 @@
+"""
+ChunkedSignal module
+
+Contains an out-of-core signal: the samples live in a raw binary file on disk and are only ever
+processed one chunk at a time, so signals larger than memory can be transformed.
+
+The methods mirror `TimeSignal` (normalize, remove_dc, cumulative_sum, quantize_w_bits, ...,
+switch_domain) so code ports with minimal changes. Every operation spills its result into a new
+temporary file and returns a new ChunkedSignal; operations that need global statistics run two
+passes (statistics first, then the transform) through `SignalStream`.
+"""
+
+import math
+import os
+import tempfile
+import weakref
+from typing import Iterator, List
+
+import numpy as np
+
+from dsp.enums.signal_domain import SIGNAL_DOMAIN
+from dsp.models.FrequencySignal import FrequencySignal
+from dsp.models.SignalStream import DEFAULT_CHUNK_SIZE, SignalStream
+from dsp.models.TimeSignal import TimeSignal
+
+# Samples switch_domain holds in memory at once (64 MB of complex128); larger signals use the
+# out-of-core four-step FFT
+FFT_MEMORY_BUDGET = 1 << 22
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class ChunkedSignal:
+    def __init__(
+        self,
+        path: str,
+        signal_domain: SIGNAL_DOMAIN,
+        is_periodic: bool,
+        sample_count: int,
+        start_time: int = 0,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        sample_freq: float | None = None,
+        temporary: bool = False,
+        directory: str | None = None,
+    ) -> None:
+        """
+        @param path: raw file holding float64 (time domain) or complex128 (frequency domain) samples
+        @param temporary: delete the file once this signal is garbage collected
+        @param directory: where spilled intermediates are written, defaults to the system temp dir
+        """
+
+        self.path = path
+        self.signal_domain = signal_domain
+        self.is_periodic = is_periodic
+        self.sample_count = sample_count
+        self.start_time = start_time
+        self.chunk_size = chunk_size
+        self.sample_freq = sample_freq
+        self.directory = directory
+
+        if temporary:
+            weakref.finalize(self, _remove_file, path)
+
+    @property
+    def dtype(self):
+        return np.float64 if self.signal_domain == SIGNAL_DOMAIN.TIME else np.complex128
+
+    def __len__(self):
+        return self.sample_count
+
+    # region: Storage
+    def memmap(self, mode: str = "r"):
+        return np.memmap(self.path, dtype=self.dtype, mode=mode, shape=(self.sample_count,))
+
+    def chunks(self) -> Iterator[np.ndarray]:
+        if self.sample_count == 0:
+            return
+
+        data = self.memmap()
+        for i in range(0, self.sample_count, self.chunk_size):
+            yield np.array(data[i : i + self.chunk_size])
+
+    def stream(self):
+        if self.signal_domain != SIGNAL_DOMAIN.TIME:
+            raise ValueError("Only time domain signals can be streamed")
+
+        return SignalStream(self.is_periodic, self.sample_count, self.start_time, self.chunks)
+
+    def spill_path(self):
+        fd, path = tempfile.mkstemp(suffix=".bin", prefix="dsp-", dir=self.directory)
+        os.close(fd)
+        return path
+
+    @staticmethod
+    def from_stream(
+        stream: SignalStream,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        directory: str | None = None,
+    ):
+        """
+        Write a stream to a temporary file, one chunk at a time
+        """
+
+        fd, path = tempfile.mkstemp(suffix=".bin", prefix="dsp-", dir=directory)
+        count = 0
+        with os.fdopen(fd, "wb") as file:
+            for chunk in stream:
+                np.asarray(chunk, dtype=np.float64).tofile(file)
+                count += len(chunk)
+
+        return ChunkedSignal(
+            path,
+            SIGNAL_DOMAIN.TIME,
+            stream.is_periodic,
+            count,
+            stream.start_time,
+            chunk_size,
+            temporary=True,
+            directory=directory,
+        )
+
+    @staticmethod
+    def from_signal(signal: TimeSignal, chunk_size: int = DEFAULT_CHUNK_SIZE, directory: str | None = None):
+        return ChunkedSignal.from_stream(SignalStream.from_signal(signal, chunk_size), chunk_size, directory)
+
+    @staticmethod
+    def read(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, directory: str | None = None):
+        """
+        Convert a time domain signal file into chunked storage without loading it in memory
+        """
+
+        return ChunkedSignal.from_stream(SignalStream.read(path, chunk_size), chunk_size, directory)
+
+    def save(self, path: str):
+        self.stream().save(path)
+
+    def to_signal(self):
+        """
+        Load the whole signal into a TimeSignal / FrequencySignal
+        """
+
+        if self.signal_domain == SIGNAL_DOMAIN.TIME:
+            return self.stream().to_signal()
+
+        harmonics: List[complex] = []
+        for chunk in self.chunks():
+            harmonics.extend(chunk.tolist())
+
+        return FrequencySignal(
+            self.is_periodic, self.sample_count, harmonics=harmonics, sample_freq=self.sample_freq
+        )
+
+    def stats(self):
+        return self.stream().stats()
+
+    def __spill(self, stream: SignalStream):
+        return ChunkedSignal.from_stream(stream, self.chunk_size, self.directory)
+    # endregion
+
+    # region: Operations
+    def __mul__(self, scalar: float):
+        return self.__spill(self.stream() * scalar)
+
+    def square(self):
+        return self.__spill(self.stream().square())
+
+    def normalize(self):
+        return self.__spill(self.stream().normalize())
+
+    def remove_dc(self):
+        return self.__spill(self.stream().remove_dc())
+
+    def cumulative_sum(self):
+        return self.__spill(self.stream().cumulative_sum())
+
+    def quantize_w_bits(self, bit_count: int):
+        """
+        Unlike `TimeSignal.quantize_w_bits`, returns the quantized signal (level midpoints) only
+        """
+
+        return self.__spill(self.stream().quantize_w_bits(bit_count))
+
+    def quantize_w_levels(self, level_count: int):
+        """
+        Unlike `TimeSignal.quantize_w_levels`, returns the quantized signal (level midpoints) only
+        """
+
+        return self.__spill(self.stream().quantize_w_levels(level_count))
+
+    def switch_domain(self, sampling_freq: float | None = None, memory_budget: int | None = None):
+        """
+        Out-of-core DFT (time domain) or IDFT (frequency domain) using the four-step FFT.
+
+        The N samples are viewed as an N2 x N1 matrix (N = N1 * N2, N1 the divisor closest to
+        sqrt(N)) and every pass reads contiguous blocks of rows of at most memory_budget samples:
+        1. transpose the rows into an N1 x N2 scratch file
+        2. FFT every row there (the columns of the original view), multiply by the twiddle factors
+           W_N^(n1 * k2) and write the rows transposed into a second N2 x N1 scratch file
+        3. FFT every row of that, writing the transposed result
+        Each pass reads every file once, whatever the block size.
+
+        @param memory_budget: most samples held in memory at once
+        @default: FFT_MEMORY_BUDGET
+        @raise ValueError: N is larger than the budget and has no split with both factors within it
+        (e.g. a large prime, or twice a large prime); pad the signal or raise the budget
+        """
+
+        inverse = self.signal_domain == SIGNAL_DOMAIN.FREQUENCY
+        fft = np.fft.ifft if inverse else np.fft.fft
+        sign = 1 if inverse else -1
+
+        N = self.sample_count
+        if N == 0:
+            raise ValueError("Cannot transform an empty signal")
+
+        budget = memory_budget or FFT_MEMORY_BUDGET
+        out_path = self.spill_path()
+
+        if N <= budget:
+            out = np.memmap(out_path, dtype=np.complex128, mode="w+", shape=(N,))
+            out[:] = fft(self.memmap())
+            out.flush()
+            del out
+        else:
+            N1 = max(d for d in range(1, math.isqrt(N) + 1) if N % d == 0)
+            N2 = N // N1
+            if N2 > budget:
+                _remove_file(out_path)
+                raise ValueError(
+                    f"{N} samples can't be split into two factors of at most {budget} samples "
+                    f"(best split {N1} x {N2}); pad the signal or raise the memory budget"
+                )
+
+            self.__four_step(fft, sign, N1, N2, budget, out_path)
+
+        if inverse:
+            # the time axis only needs the real part
+            real_path = self.spill_path()
+            with open(real_path, "wb") as file:
+                result = np.memmap(out_path, dtype=np.complex128, mode="r", shape=(N,))
+                for i in range(0, N, self.chunk_size):
+                    result[i : i + self.chunk_size].real.astype(np.float64).tofile(file)
+                del result
+            _remove_file(out_path)
+
+            return ChunkedSignal(
+                real_path, SIGNAL_DOMAIN.TIME, self.is_periodic, N, 0,
+                self.chunk_size, temporary=True, directory=self.directory,
+            )
+
+        return ChunkedSignal(
+            out_path, SIGNAL_DOMAIN.FREQUENCY, self.is_periodic, N, 0,
+            self.chunk_size, sampling_freq, temporary=True, directory=self.directory,
+        )
+
+    def __four_step(self, fft, sign: int, N1: int, N2: int, budget: int, out_path: str):
+        N = N1 * N2
+        source = self.memmap().reshape(N2, N1)
+        columns_path = self.spill_path()
+        rows_path = self.spill_path()
+
+        try:
+            # step 1: x[n1 + N1 n2] by n1, then n2
+            columns = np.memmap(columns_path, dtype=np.complex128, mode="w+", shape=(N1, N2))
+            block = max(1, budget // N1)
+            for r in range(0, N2, block):
+                columns[:, r : r + block] = source[r : r + block].T
+
+            # step 2: FFTs over n2, twiddled, stored by k2 then n1
+            rows = np.memmap(rows_path, dtype=np.complex128, mode="w+", shape=(N2, N1))
+            block = max(1, budget // N2)
+            k2 = np.arange(N2)
+            for r in range(0, N1, block):
+                n1 = np.arange(r, min(r + block, N1))[:, None]
+                spectra = fft(columns[r : r + block], axis=1) * np.exp(sign * 2j * np.pi * n1 * k2 / N)
+                rows[:, r : r + block] = spectra.T
+            del columns
+
+            # step 3: FFTs over n1, X[k1 N2 + k2] stored by k1 then k2
+            out = np.memmap(out_path, dtype=np.complex128, mode="w+", shape=(N1, N2))
+            block = max(1, budget // N1)
+            for r in range(0, N2, block):
+                out[:, r : r + block] = fft(rows[r : r + block], axis=1).T
+
+            out.flush()
+            del rows, out
+        finally:
+            _remove_file(columns_path)
+            _remove_file(rows_path)
+    # endregion
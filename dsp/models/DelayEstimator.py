@@ -0,0 +1,124 @@
+"""
+DelayEstimator module
+
+Estimates the time delay between the two signals of many pairs at once.
+The delay of a pair is the lag at which the cross-correlation r12(l) = sum_n x1(n) * x2(n + l)
+peaks, refined below one sample by fitting a parabola through the peak and its neighbours.
+
+Every distinct signal is transformed once per FFT size, so a reference shared by many pairs costs a
+single FFT. Pairs are split across the worker threads.
+"""
+
+import math
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from dsp.models.TimeSignal import TimeSignal
+from dsp.utils.convolution import fft_length
+from dsp.utils.parallel import get_executor, get_workers
+
+# Pairs per thread below which splitting the batch isn't worth the hand-off
+MIN_PAIRS_PER_WORKER = 16
+
+
+class DelayEstimator:
+    def __init__(self, max_lag: int | None = None, workers: int | None = None) -> None:
+        """
+        @param max_lag: only search the delays -max_lag .. max_lag
+        @default: every lag of the linear correlation
+        @param workers: number of threads the pairs are split across
+        """
+
+        if max_lag is not None and max_lag < 0:
+            raise ValueError("Maximum lag must not be negative")
+
+        self.max_lag = max_lag
+        self.workers = workers
+
+    @staticmethod
+    def interpolate_peak(before: float, peak: float, after: float) -> Tuple[float, float]:
+        """
+        Vertex of the parabola through three equally spaced points around a maximum
+
+        @return: (offset of the vertex from the middle point in samples, value at the vertex)
+        """
+
+        curvature = before - 2 * peak + after
+        if curvature >= 0:
+            return 0.0, peak
+
+        offset = 0.5 * (before - after) / curvature
+        return offset, peak - 0.25 * (before - after) * offset
+
+    def estimate(self, pairs: "Sequence[Tuple[TimeSignal | np.ndarray, TimeSignal | np.ndarray]]"):
+        """
+        Estimate the delay of the second signal of every pair relative to the first one
+
+        @param pairs: (reference, signal) tuples of TimeSignals or amplitude arrays (starting at 0)
+        @return: array of shape (pairs, 2), holding the delay in time units and the normalized
+        correlation at the peak; both are NaN when a pair has no lag to search or no energy
+        """
+
+        signals: Dict[int, Tuple[np.ndarray, int, float]] = {}
+        for pair in pairs:
+            for s in pair:
+                if id(s) not in signals:
+                    signals[id(s)] = DelayEstimator.__samples(s)
+
+        # every distinct (signal, FFT size) is transformed once
+        sizes = [
+            fft_length(len(signals[id(a)][0]) + len(signals[id(b)][0]) - 1) for a, b in pairs
+        ]
+        keys = list({(id(s), n) for (a, b), n in zip(pairs, sizes) for s in (a, b)})
+        spectra = dict(
+            zip(keys, self.__map(lambda k: np.fft.rfft(signals[k[0]][0], k[1]), keys))
+        )
+
+        def correlate(i: int):
+            a, b = pairs[i]
+            x1, t1, E1 = signals[id(a)]
+            x2, t2, E2 = signals[id(b)]
+            n = sizes[i]
+            r = np.fft.irfft(np.conj(spectra[(id(a), n)]) * spectra[(id(b), n)], n)
+            return self.__peak(r, len(x1), len(x2), t2 - t1, E1 * E2)
+
+        return np.array(self.__map(correlate, range(len(pairs))), dtype=float).reshape(-1, 2)
+
+    @staticmethod
+    def __samples(signal: "TimeSignal | np.ndarray"):
+        if isinstance(signal, TimeSignal):
+            x = np.asarray(signal["amp"][: signal.sample_count], dtype=float)
+            start = int(signal["time"][0]) if len(x) else 0
+        else:
+            x = np.asarray(signal, dtype=float)
+            start = 0
+
+        return x, start, float(np.dot(x, x))
+
+    def __peak(self, r: np.ndarray, n1: int, n2: int, offset: int, energy: float):
+        # a lag of d samples between the arrays is d + offset in time
+        first, last = -(n1 - 1), n2 - 1
+        if self.max_lag is not None:
+            first = max(first, -self.max_lag - offset)
+            last = min(last, self.max_lag - offset)
+        if first > last or energy == 0:
+            return math.nan, math.nan
+
+        # negative lags sit at the end of the circular result
+        values = r[np.arange(first, last + 1) % len(r)]
+        k = int(np.argmax(values))
+
+        shift, peak = 0.0, values[k]
+        if 0 < k < len(values) - 1:
+            shift, peak = DelayEstimator.interpolate_peak(values[k - 1], values[k], values[k + 1])
+
+        return first + k + shift + offset, peak / math.sqrt(energy)
+
+    def __map(self, fn, items):
+        items = list(items)
+        workers = min(get_workers(self.workers), max(1, len(items) // MIN_PAIRS_PER_WORKER))
+        if workers == 1:
+            return [fn(item) for item in items]
+
+        return list(get_executor(workers).map(fn, items, chunksize=MIN_PAIRS_PER_WORKER))
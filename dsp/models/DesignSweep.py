@@ -0,0 +1,143 @@
+"""
+DesignSweep module
+
+Searches a set of FIR filter specs for the cheapest filter that meets a set of requirements.
+Every candidate spec (a `Pipeline` filter spec: filter_type, cutoffs, stopband_attenuation,
+transition_band, window...) is designed and its frequency response measured with
+`FirFilter.verify`, spread across a process pool. Candidates that meet their own spec and the
+sweep's requirements are ranked by tap count, then by the estimated time to filter a signal of
+the given length.
+"""
+
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from dsp.models.Filter import FilterReport
+from dsp.models.Pipeline import build_filter
+from dsp.utils.convolution import convolution_cost
+
+# Specs handed to a worker process at a time
+SPECS_PER_TASK = 4
+
+_seconds_per_mac: float | None = None
+
+
+class SweepCandidate(NamedTuple):
+    spec: Dict[str, Any]
+    taps: int
+    window: str
+    report: FilterReport
+    cost: float  # estimated multiply-adds to filter the signal
+    runtime: float  # estimated seconds to filter the signal
+
+
+def seconds_per_mac() -> float:
+    """
+    Time of one np.convolve multiply-add on this machine, measured once
+    """
+
+    global _seconds_per_mac
+    if _seconds_per_mac is None:
+        x, h = np.ones(1 << 16), np.ones(64)
+        start = time.perf_counter()
+        for _ in range(4):
+            np.convolve(x, h)
+        _seconds_per_mac = (time.perf_counter() - start) / (4 * len(x) * len(h))
+
+    return _seconds_per_mac
+
+
+def _evaluate(task: Tuple[Dict[str, Any], int, float | None]):
+    spec, n_points, max_ripple = task
+    try:
+        fil = build_filter(spec)
+        report = fil.verify(n_points, max_ripple)
+    except ValueError:
+        return None
+
+    return fil.coefficient_count, fil.window.name or "", report
+
+
+class DesignSweep:
+    def __init__(
+        self,
+        specs: Iterable[Dict[str, Any]],
+        min_attenuation: float | None = None,
+        max_transition: float | None = None,
+        max_ripple: float | None = None,
+        n_points: int = 8193,
+    ) -> None:
+        """
+        @param specs: candidate filter specs, see `grid`
+        @param min_attenuation: measured stopband attenuation (dB) every candidate must reach
+        @param max_transition: widest measured transition band (Hz) allowed
+        @param max_ripple: largest measured passband ripple (dB) allowed
+        @param n_points: frequency grid of the measurement, see `FirFilter.frequency_response`
+        """
+
+        self.specs = [dict(spec) for spec in specs]
+        self.min_attenuation = min_attenuation
+        self.max_transition = max_transition
+        self.max_ripple = max_ripple
+        self.n_points = n_points
+
+    @staticmethod
+    def grid(base: Dict[str, Any], **axes: Sequence[Any]) -> List[Dict[str, Any]]:
+        """
+        Every combination of the axis values on top of the base spec, e.g.
+        `grid({"filter_type": "LOW_PASS", ...}, window=[None, "Kaiser"], transition_band=[300, 500])`
+        """
+
+        names = list(axes)
+        return [
+            {**base, **dict(zip(names, values))}
+            for values in itertools.product(*(axes[name] for name in names))
+        ]
+
+    def meets_requirements(self, report: FilterReport) -> bool:
+        return (
+            report.meets_spec
+            and (self.min_attenuation is None or report.stopband_attenuation >= self.min_attenuation)
+            and (self.max_transition is None or report.transition_width <= self.max_transition)
+            and (self.max_ripple is None or report.passband_ripple <= self.max_ripple)
+        )
+
+    def run(self, sample_count: int, workers: int | None = None) -> List[SweepCandidate]:
+        """
+        Design and measure every spec, and rank the compliant ones
+
+        @param sample_count: length of the signals the filter will run on, for the runtime estimate
+        @param workers: number of processes
+        @default: one per CPU core
+        @return: compliant candidates, fewest taps first (then fastest); invalid specs are skipped
+        """
+
+        tasks = [(spec, self.n_points, self.max_ripple) for spec in self.specs]
+        workers = min(max(1, workers or os.cpu_count() or 1), max(1, len(tasks) // SPECS_PER_TASK))
+
+        if workers == 1:
+            results = [_evaluate(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(workers) as executor:
+                results = list(executor.map(_evaluate, tasks, chunksize=SPECS_PER_TASK))
+
+        rate = seconds_per_mac()
+        candidates = []
+        for spec, result in zip(self.specs, results):
+            if result is None:
+                continue
+
+            taps, window, report = result
+            if not self.meets_requirements(report):
+                continue
+
+            cost = convolution_cost(sample_count, taps)
+            candidates.append(SweepCandidate(spec, taps, window, report, cost, cost * rate))
+
+        candidates.sort(key=lambda c: (c.taps, c.runtime))
+        return candidates
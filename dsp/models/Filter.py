@@ -2,13 +2,32 @@
 Filter module
 
 Contains a Filter class that is used to filter signals.
-Filter class represents FIR filters, as we will not be implementing IIR filters.
+Filter class represents FIR filters; IIR filters designed from the same spec are in `IirFilter`.
 """
 
-import math
-from typing import Tuple
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
 from dsp.enums.filter_type import FILTER_TYPE
+from dsp.models.KaiserWindow import KaiserWindow
 from dsp.models.Window import Window
+from dsp.utils.convolution import (
+    LinearPhaseConvolver,
+    PartitionedConvolver,
+    StreamingConvolver,
+    symmetry,
+)
+
+
+class FilterReport(NamedTuple):
+    """
+    Measured response of a filter against its spec (frequencies in Hz, levels in dB)
+    """
+
+    passband_ripple: float  # largest deviation from 0 dB in the passband(s)
+    stopband_attenuation: float  # smallest attenuation in the stopband(s)
+    transition_width: float  # widest transition band
+    meets_spec: bool
 
 
 class FirFilter:
@@ -21,7 +40,14 @@ class FirFilter:
         cutoff: float | None = None,
         highcutoff: float | None = None,
         lowcutoff: float | None = None,
+        window: Window | str | None = None,
     ) -> None:
+        """
+        @param window: a Window, or the name of one of `windows` or "Kaiser" (designed for the
+        stopband attenuation, fewest taps)
+        @default: the first window of `windows` that meets the stopband attenuation
+        """
+
         # define specifications
         self.sampling_frequency = sampling_frequency
         self.filter_type = filter_type
@@ -41,7 +67,7 @@ class FirFilter:
         self.transition_band = self.transition_band / self.sampling_frequency
 
         # get window
-        self.window = self.getWindow()
+        self.window = self.getWindow(window)
         self.coefficient_count = self.window.getCoefficientCount(self.transition_band)
 
         # Normalize cutoff frequencies
@@ -55,10 +81,7 @@ class FirFilter:
 
         if self.filter_type == FILTER_TYPE.LOW_PASS:
             assert self.cutoff is not None
-            print("Cut off frequency (not shifted): ", self.cutoff)
-            print("Transition band: ", self.transition_band)
             self.wc = self.cutoff + self.transition_band / 2
-            print("Cut off frequency: ", self.wc)
         elif self.filter_type == FILTER_TYPE.HIGH_PASS:
             assert self.cutoff is not None
             self.wc = self.cutoff - self.transition_band / 2
@@ -75,15 +98,12 @@ class FirFilter:
         self.hD = self.get_filter()
         N = self.coefficient_count
         m = (N - 1) // 2
-        d_hd = [self.hD(n) for n in range(-m, m + 1)]
-        print("---------\nhD(n)\n-----------", d_hd)
-        d_window = [self.window.fn(n, N) for n in range(-m, m + 1)]
-        print("---------\nwindow(n)\n-----------", d_window)
-        self.coefficients = [d_hd[n] * d_window[n] for n in range(0, m + 1)]
-        self.coefficients = self.coefficients + list(reversed(self.coefficients[:-1]))
 
-        print("---------\ffilter(n)\n-----------")
-        print(self.coefficients)
+        # first half (n = -m .. 0) as whole arrays, then mirrored
+        n = np.arange(-m, 1)
+        half = self.hD(n) * self.window.samples(N)[: m + 1]
+        self.coefficients = np.concatenate([half, half[-2::-1]]).tolist()
+        self.__spectra: Dict[int, np.ndarray] = {}
 
     def to_signal(self):
         from dsp.models.TimeSignal import TimeSignal
@@ -94,43 +114,251 @@ class FirFilter:
             [*self.coefficients]
         ])
 
+    def spectrum(self, n: int) -> np.ndarray:
+        """
+        n point DFT of the coefficients on their own time axis (-m .. m, negative times wrapped to
+        the end), i.e. what multiplies the spectrum of an n sample signal. Cached per n.
+        For n < coefficient_count the coefficients are time aliased (h[k] summed over k mod n), which
+        is the same as sampling the filter's frequency response at the n DFT frequencies.
+        The returned array is shared, so it is read-only.
+        """
+
+        if n <= 0:
+            raise ValueError("DFT length must be positive")
+
+        if n not in self.__spectra:
+            m = (self.coefficient_count - 1) // 2
+            kernel = np.zeros(n)
+            np.add.at(kernel, np.arange(-m, m + 1) % n, self.coefficients)
+
+            spectrum = np.fft.fft(kernel)
+            spectrum.setflags(write=False)
+            self.__spectra[n] = spectrum
+
+        return self.__spectra[n]
+
+    def bands(self) -> Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]:
+        """
+        (passbands, stopbands) required by the spec, as (low, high) normalized frequency ranges.
+        The cutoffs are passband edges, the stopbands start one transition band away.
+        Bands are clipped to 0 .. 0.5; a band that lies entirely outside is left out.
+        """
+
+        tb = self.transition_band
+        if self.filter_type == FILTER_TYPE.LOW_PASS:
+            passbands, stopbands = [(0, self.cutoff)], [(self.cutoff + tb, 0.5)]
+        elif self.filter_type == FILTER_TYPE.HIGH_PASS:
+            passbands, stopbands = [(self.cutoff, 0.5)], [(0, self.cutoff - tb)]
+        else:
+            low, high = self.lowcutoff, self.highcutoff
+            if self.filter_type == FILTER_TYPE.BAND_PASS:
+                passbands, stopbands = [(low, high)], [(0, low - tb), (high + tb, 0.5)]
+            else:
+                passbands, stopbands = [(0, low), (high, 0.5)], [(low + tb, high - tb)]
+
+        def clip(bands: List[Tuple[float, float]]):
+            bands = [(max(low, 0), min(high, 0.5)) for low, high in bands]
+            return [(low, high) for low, high in bands if low <= high]
+
+        return clip(passbands), clip(stopbands)
+
+    def frequency_response(self, n_points: int = 4097):
+        """
+        Magnitude and phase on n_points frequencies evenly spaced from 0 to fs / 2, taken from
+        `spectrum` of length 2 (n_points - 1); a power of two plus one keeps that FFT fast
+
+        @return: FrequencySignal with the frequency (in Hz) on the freq axis, the magnitude on the
+        amp axis and the phase of the causal filter (first coefficient at n = 0) on the pshift axis
+        """
+
+        from dsp.models.FrequencySignal import FrequencySignal
+
+        if n_points < 2:
+            raise ValueError("At least 2 frequency points are needed")
+        n = 2 * (n_points - 1)
+
+        m = (self.coefficient_count - 1) // 2
+        k = np.arange(n_points)
+        # the spectrum is centered on n = 0, delay it by m samples
+        response = self.spectrum(n)[:n_points] * np.exp(-2j * np.pi * k * m / n)
+
+        return FrequencySignal.from_response(k * self.sampling_frequency / n, response)
+
+    def verify(self, n_points: int = 8193, max_passband_ripple: float | None = None) -> FilterReport:
+        """
+        Measure the frequency response against the spec
+
+        The transition width is measured from the farthest frequency still within the measured
+        passband ripple to the nearest frequency past which the stopband attenuation is reached.
+
+        @param max_passband_ripple: also require the passband ripple to be at most this many dB
+        @default: the spec has no passband requirement, only the stopband and transition band count
+        """
+
+        passbands, stopbands = self.bands()
+        if not passbands or not stopbands:
+            raise ValueError("The spec has no passband or no stopband between 0 and half the sampling frequency")
+
+        response = self.frequency_response(n_points)
+        freq = np.asarray(response["freq"]) / self.sampling_frequency
+        with np.errstate(divide="ignore"):
+            gain = 20 * np.log10(np.asarray(response["amp"]))
+
+        step = freq[1]
+
+        # half a grid step of slack, so every band holds at least one grid point
+        def band(low: float, high: float):
+            return (freq >= low - step / 2) & (freq <= high + step / 2)
+
+        in_pass = np.any([band(*b) for b in passbands], axis=0)
+        in_stop = np.any([band(*b) for b in stopbands], axis=0)
+        ripple = float(np.max(np.abs(gain[in_pass])))
+        attenuation = float(-np.max(gain[in_stop]))
+
+        widths = []
+        for p_low, p_high in passbands:
+            for s_low, s_high in stopbands:
+                if s_low >= p_high:
+                    edges = (p_high, s_low, 1)  # stopband above the passband
+                elif s_high <= p_low:
+                    edges = (p_low, s_high, -1)  # stopband below the passband
+                else:
+                    continue
+                if abs(edges[1] - edges[0]) <= self.transition_band + 1e-12:
+                    widths.append(self.__transition(freq, gain, ripple, *edges))
+        if not widths:
+            raise ValueError("The spec has no transition band between 0 and half the sampling frequency")
+
+        width = float(max(widths)) * self.sampling_frequency
+        meets_spec = (
+            attenuation >= self.stopband_attenuation
+            and width <= (self.transition_band + step) * self.sampling_frequency
+            and (max_passband_ripple is None or ripple <= max_passband_ripple)
+        )
+
+        return FilterReport(ripple, attenuation, width, meets_spec)
+
+    def __transition(self, freq: np.ndarray, gain: np.ndarray, ripple: float, pass_edge: float, stop_edge: float, direction: int):
+        # walk from the spec passband edge towards the stopband while the gain stays within the ripple
+        i = int(np.argmin(np.abs(freq - pass_edge)))
+        while 0 <= i + direction < len(freq) and abs(gain[i + direction]) <= ripple:
+            i += direction
+
+        # walk from the spec stopband edge towards the passband while the attenuation holds
+        j = int(np.argmin(np.abs(freq - stop_edge)))
+        if -gain[j] >= self.stopband_attenuation:
+            while 0 <= j - direction < len(freq) and -gain[j - direction] >= self.stopband_attenuation:
+                j -= direction
+        else:
+            # not reached at the spec edge: look further into the stopband
+            while 0 <= j + direction < len(freq) and -gain[j] < self.stopband_attenuation:
+                j += direction
+
+        return abs(freq[j] - freq[i])
+
     def apply(self, signal):
         """
         Apply the filter on the input signal x
+
+        Symmetric and antisymmetric (linear phase) coefficients go through `LinearPhaseConvolver`
         """
 
-        return signal.convolve(
-            self.to_signal()
+        convolver = self.stream()
+        if not isinstance(convolver, LinearPhaseConvolver):
+            return signal.convolve(self.to_signal())
+
+        from dsp.models.TimeSignal import TimeSignal
+        amp = convolver.convolve(signal["amp"][: len(signal)])
+        m = (self.coefficient_count - 1) // 2
+
+        # same time axis as `TimeSignal.convolve` with `to_signal()`
+        start_time = int(min(signal["time"][0], -m))
+        return TimeSignal(
+            signal.is_periodic, len(amp), [list(range(start_time, start_time + len(amp))), amp.tolist()]
         )
 
+    def stream(self, block_size: int | None = None):
+        """
+        Create a stateful convolver that applies the filter chunk by chunk.
+
+        Feeding every chunk of a signal through `process` and then calling `flush`
+        gives the same samples as `apply`.
+
+        @param block_size: use a `PartitionedConvolver` with this latency (in samples), which keeps
+        long filters cheap in low latency paths
+        @default: outputs every processed sample immediately
+        """
+
+        if block_size is not None:
+            return PartitionedConvolver(self.coefficients, block_size)
+
+        parity = symmetry(self.coefficients)
+        if parity:
+            return LinearPhaseConvolver(self.coefficients, parity)
+
+        return StreamingConvolver(self.coefficients)
+
     # region: Windows
-    def getWindow(self):
-        for window in self.windows:
-            if window.stopband_attenuation >= self.stopband_attenuation:
-                print(f"Using {window.name} window")
+    def getWindow(self, window: Window | str | None = None):
+        if window is None:
+            for window in self.windows:
+                if window.stopband_attenuation >= self.stopband_attenuation:
+                    return window
+
+            raise ValueError("No window found for the given stopband attenuation")
+
+        if isinstance(window, str):
+            if window.lower() == "kaiser":
+                return KaiserWindow(self.stopband_attenuation)
+            window = FirFilter.find_window(window)
+
+        if window.stopband_attenuation < self.stopband_attenuation:
+            raise ValueError(
+                f"{window.name} window only reaches {window.stopband_attenuation} dB of stopband attenuation"
+            )
+
+        return window
+
+    def tap_savings(self) -> int | None:
+        """
+        Taps saved by this filter's window compared to the window `getWindow` picks from the table
+        (negative if this filter is longer), None if no table window meets the spec
+        """
+
+        try:
+            table_window = self.getWindow()
+        except ValueError:
+            return None
+
+        return table_window.getCoefficientCount(self.transition_band) - self.coefficient_count
+
+    @staticmethod
+    def find_window(name: str):
+        for window in FirFilter.windows:
+            if window.name and window.name.lower() == name.lower():
                 return window
 
-        raise ValueError("No window found for the given stopband attenuation")
+        raise ValueError(f"Unknown window '{name}'")
 
     rectangularWindow = Window(
-        fn=lambda n, N: 1, stopbandAttenuation=21, transitionWidthFactor=0.9, name="Rectangular"
+        fn=lambda n, N: np.ones(np.shape(n)), stopbandAttenuation=21, transitionWidthFactor=0.9, name="Rectangular"
     )
     hanningWindow = Window(
-        fn=lambda n, N: 0.5 + 0.5 * math.cos(2 * math.pi * n / N),
+        fn=lambda n, N: 0.5 + 0.5 * np.cos(2 * np.pi * n / N),
         stopbandAttenuation=44,
         transitionWidthFactor=3.1,
         name="Hanning",
     )
     hammingWindow = Window(
-        fn=lambda n, N: 0.54 + 0.46 * math.cos(2 * math.pi * n / N),
+        fn=lambda n, N: 0.54 + 0.46 * np.cos(2 * np.pi * n / N),
         stopbandAttenuation=53,
         transitionWidthFactor=3.3,
         name="Hamming",
     )
     blackmanWindow = Window(
         fn=lambda n, N: 0.42
-        + 0.5 * math.cos(2 * math.pi * n / (N - 1))
-        + 0.08 * math.cos(4 * math.pi * n / (N - 1)),
+        + 0.5 * np.cos(2 * np.pi * n / (N - 1))
+        + 0.08 * np.cos(4 * np.pi * n / (N - 1)),
         stopbandAttenuation=74,
         transitionWidthFactor=5.5,
         name="Blackman",
@@ -157,19 +385,23 @@ class FirFilter:
         else:
             raise ValueError("Invalid filter type")
 
+    @staticmethod
+    def ideal_low_pass(wc: float, n):
+        """
+        Ideal low pass impulse response sin(2π wc n) / (π n), 2 wc at n = 0
+        """
+
+        return 2 * wc * np.sinc(2 * wc * np.asarray(n, dtype=float))
+
     def low_pass_filter(self):
         if self.filter_type != FILTER_TYPE.LOW_PASS:
             raise ValueError("Filter type must be LOW_PASS")
         if self.wc is None:
             raise ValueError("Cutoff frequency must be provided for low pass filter")
 
-        def fn(n: int) -> float:
+        def fn(n):
             assert self.wc is not None
-            return (
-                self.wc * 2
-                if n == 0
-                else math.sin(2 * math.pi * self.wc * n) / (math.pi * n)
-            )
+            return FirFilter.ideal_low_pass(self.wc, n)
 
         return fn
 
@@ -179,14 +411,9 @@ class FirFilter:
         if self.wc is None:
             raise ValueError("Cutoff frequency must be provided for high pass filter")
 
-        def fn(n: int) -> float:
+        def fn(n):
             assert self.wc is not None
-            return (
-                1 - self.wc * 2
-                if n == 0
-                else -math.sin(2 * math.pi * self.wc * n)
-                / (math.pi * n)
-            )
+            return np.equal(n, 0) - FirFilter.ideal_low_pass(self.wc, n)
 
         return fn
 
@@ -196,18 +423,9 @@ class FirFilter:
         if self.wc1 is None or self.wc2 is None:
             raise ValueError("Low and high cutoff frequencies must be provided")
 
-        def fn(n: int) -> float:
+        def fn(n):
             assert self.wc1 is not None and self.wc2 is not None
-            return (
-                (self.wc2 - self.wc1) * 2
-                if n == 0
-                else (
-                    math.sin(2 * math.pi * self.wc2 * n)
-                    / (math.pi * n)
-                    - math.sin(2 * math.pi * self.wc1 * n)
-                    / (math.pi * n)
-                )
-            )
+            return FirFilter.ideal_low_pass(self.wc2, n) - FirFilter.ideal_low_pass(self.wc1, n)
 
         return fn
 
@@ -217,17 +435,12 @@ class FirFilter:
         if self.wc2 is None or self.wc1 is None:
             raise ValueError("Low and high cutoff frequencies must be provided")
 
-        def fn(n: int) -> float:
+        def fn(n):
             assert self.wc1 is not None and self.wc2 is not None
             return (
-                1-((self.wc2 - self.wc1) * 2)
-                if n == 0
-                else (
-                    math.sin(2 * math.pi * self.wc1 * n)
-                    / (math.pi * n)
-                    - math.sin(2 * math.pi * self.wc2 * n)
-                    / (math.pi * n)
-                )
+                np.equal(n, 0)
+                + FirFilter.ideal_low_pass(self.wc1, n)
+                - FirFilter.ideal_low_pass(self.wc2, n)
             )
 
         return fn
@@ -0,0 +1,131 @@
+"""
+FilterBank module
+
+Applies many FIR filters to the same signal with a shared input transform.
+The input is cut into blocks of `block_size` samples, and every block is transformed once. Each
+filter's output block is then the product with that filter's cached spectrum (one batched inverse
+FFT for the whole bank), overlap-added to the previous block's tail.
+
+In energy-only mode only the energy of each filtered signal is accumulated, so the filtered
+signals are never stored.
+"""
+
+from typing import List, Sequence
+
+import numpy as np
+
+from dsp.models.Filter import FirFilter
+from dsp.models.TimeSignal import TimeSignal
+from dsp.utils.convolution import fft_length
+
+# Smallest input block, keeps the per-block overhead low for short filters
+MIN_BLOCK_SIZE = 1024
+
+
+class FilterBank:
+    def __init__(self, filters: Sequence[FirFilter], block_size: int | None = None) -> None:
+        """
+        @param block_size: input samples transformed at a time
+        @default: at least MIN_BLOCK_SIZE and the longest filter, rounded up to a power of two
+        """
+
+        if not filters:
+            raise ValueError("A filter bank needs at least one filter")
+
+        self.filters = list(filters)
+        self.taps = max(len(f.coefficients) for f in self.filters)
+        self.block_size = block_size or max(MIN_BLOCK_SIZE, fft_length(self.taps))
+        if self.block_size <= 0:
+            raise ValueError("Block size must be positive")
+        self.fft_size = fft_length(self.block_size + self.taps - 1)
+
+        # shorter filters are zero padded at the end, their outputs are trimmed in `apply`
+        kernels = np.zeros((len(self.filters), self.taps))
+        for i, f in enumerate(self.filters):
+            kernels[i, : len(f.coefficients)] = f.coefficients
+        self.spectra = np.fft.rfft(kernels, self.fft_size, axis=1)
+
+        self.reset()
+
+    def __len__(self):
+        return len(self.filters)
+
+    def reset(self):
+        """
+        Forget every sample processed so far
+        """
+
+        self.tail = np.zeros((len(self), self.taps - 1))
+        self.pending = np.zeros(0)
+
+    def process(self, chunk) -> np.ndarray:
+        """
+        Filter the next samples of the input
+
+        @return: (filters, samples) array of the outputs completed so far
+        """
+
+        blocks = list(self.__blocks(chunk, final=False))
+        return np.concatenate(blocks, axis=1) if blocks else np.zeros((len(self), 0))
+
+    def flush(self) -> np.ndarray:
+        """
+        Complete the outputs of every filter (full linear convolution, padded to the longest filter)
+        """
+
+        return np.concatenate(list(self.__blocks([], final=True)), axis=1)
+
+    def apply(self, signal: TimeSignal, energy_only: bool = False) -> "List[TimeSignal] | np.ndarray":
+        """
+        Apply every filter to the signal
+
+        @param energy_only: return the energy of each filtered signal instead of the signals
+        @return: one filtered signal per filter, with the time axis `FirFilter.apply` gives,
+        or an array of energies
+        """
+
+        self.reset()
+        x = signal["amp"][: len(signal)]
+
+        if energy_only:
+            energy = np.zeros(len(self))
+            for block in self.__blocks(x, final=True):
+                energy += np.einsum("ij,ij->i", block, block)
+            return energy
+
+        out = np.concatenate(list(self.__blocks(x, final=True)), axis=1)
+
+        results = []
+        for f, amp in zip(self.filters, out):
+            m = (f.coefficient_count - 1) // 2
+            length = len(signal) + len(f.coefficients) - 1
+            start_time = int(min(signal["time"][0], -m))
+            results.append(TimeSignal(
+                signal.is_periodic, length, [list(range(start_time, start_time + length)), amp[:length].tolist()]
+            ))
+
+        return results
+
+    def __blocks(self, chunk, final: bool):
+        data = np.concatenate([self.pending, np.asarray(chunk, dtype=float)])
+        B = self.block_size
+
+        end = len(data) if final else len(data) // B * B
+        for start in range(0, end, B):
+            yield self.__block(data[start : start + B])
+
+        self.pending = data[end:]
+        if final:
+            tail, self.tail = self.tail, np.zeros((len(self), self.taps - 1))
+            yield tail
+
+    def __block(self, block: np.ndarray) -> np.ndarray:
+        # one forward transform for the whole bank
+        y = np.fft.irfft(np.fft.rfft(block, self.fft_size) * self.spectra, self.fft_size)
+        y = y[:, : len(block) + self.taps - 1]
+
+        overlap = self.taps - 1
+        y[:, :overlap] += self.tail
+        self.tail = y[:, len(block) :].copy()
+
+        return y[:, : len(block)]
@@ -0,0 +1,144 @@
+"""
+FilterCascade module
+
+Chains FIR filters (FirFilters, or coefficient TimeSignals on their own time axis) applied one
+after the other. Since convolution is associative, the chain is equivalent to a single filter
+whose coefficients are the convolution of every stage's coefficients; the fused filter is one
+pass over the signal instead of one pass per stage.
+
+Fusing isn't free: the stage coefficients have to be convolved once up front, and a fused kernel
+is longer than any stage. `should_fuse` compares both ways with the `convolution_cost` estimates
+and `apply` takes the cheaper one. Once fused, the kernel is kept for later signals.
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from dsp.models.Filter import FirFilter
+from dsp.models.TimeSignal import TimeSignal
+from dsp.utils.convolution import (
+    LinearPhaseConvolver,
+    StreamingConvolver,
+    auto_convolve,
+    convolution_cost,
+    symmetry,
+)
+
+
+class FilterCascade:
+    def __init__(self, stages: "Sequence[FirFilter | TimeSignal]") -> None:
+        if not stages:
+            raise ValueError("A filter cascade needs at least one stage")
+
+        self.stages = list(stages)
+        self.kernels: List[np.ndarray] = []
+        self.start_time = 0  # time of the first fused coefficient
+
+        for stage in self.stages:
+            kernel, start = FilterCascade.__kernel(stage)
+            if len(kernel) == 0:
+                raise ValueError("Filter stages must have at least one coefficient")
+            self.kernels.append(kernel)
+            self.start_time += start
+
+        self.coefficient_count = sum(len(k) for k in self.kernels) - len(self.kernels) + 1
+        self.__fused: np.ndarray | None = None
+
+    @staticmethod
+    def __kernel(stage: "FirFilter | TimeSignal") -> Tuple[np.ndarray, int]:
+        if isinstance(stage, FirFilter):
+            return np.asarray(stage.coefficients, dtype=float), -((stage.coefficient_count - 1) // 2)
+
+        return np.asarray(stage["amp"][: len(stage)], dtype=float), int(stage["time"][0])
+
+    @property
+    def coefficients(self) -> np.ndarray:
+        """
+        Coefficients of the fused filter, computed on first use
+        """
+
+        if self.__fused is None:
+            fused = self.kernels[0]
+            for kernel in self.kernels[1:]:
+                fused = auto_convolve(fused, kernel)
+            self.__fused = fused
+
+        return self.__fused
+
+    def fusion_cost(self) -> float:
+        """
+        Cost of convolving the stage coefficients together (0 once done)
+        """
+
+        if self.__fused is not None:
+            return 0.0
+
+        cost, length = 0.0, len(self.kernels[0])
+        for kernel in self.kernels[1:]:
+            cost += convolution_cost(length, len(kernel))
+            length += len(kernel) - 1
+        return cost
+
+    def cascade_cost(self, sample_count: int) -> float:
+        """
+        Cost of filtering sample_count samples with every stage in turn
+        """
+
+        cost, length = 0.0, sample_count
+        for kernel in self.kernels:
+            cost += convolution_cost(length, len(kernel))
+            length += len(kernel) - 1
+        return cost
+
+    def should_fuse(self, sample_count: int) -> bool:
+        """
+        Whether fusing (if not done yet) and filtering in one pass is cheaper than the stage by stage cascade
+        """
+
+        if len(self.kernels) == 1:
+            return True
+
+        fused_cost = self.fusion_cost() + convolution_cost(sample_count, self.coefficient_count)
+        return fused_cost <= self.cascade_cost(sample_count)
+
+    def to_signal(self):
+        coefficients = self.coefficients
+        return TimeSignal(is_periodic=False, sample_count=len(coefficients), signal_data=[
+            list(range(self.start_time, self.start_time + len(coefficients))),
+            coefficients.tolist(),
+        ])
+
+    def apply(self, signal: TimeSignal):
+        """
+        Apply every stage to the signal, fused into one pass when that is cheaper.
+        Both ways give the samples and time axis `signal.convolve(self.to_signal())` would.
+        """
+
+        x = np.asarray(signal["amp"][: len(signal)], dtype=float)
+
+        if self.should_fuse(len(x)):
+            amp = FilterCascade.__convolver(self.coefficients).convolve(x)
+        else:
+            amp = x
+            for kernel in self.kernels:
+                amp = FilterCascade.__convolver(kernel).convolve(amp)
+
+        start_time = int(min(signal["time"][0], self.start_time))
+        return TimeSignal(
+            signal.is_periodic, len(amp), [list(range(start_time, start_time + len(amp))), amp.tolist()]
+        )
+
+    def stream(self):
+        """
+        Stateful convolver of the fused filter; an unbounded stream always pays off the fusion
+        """
+
+        return FilterCascade.__convolver(self.coefficients)
+
+    @staticmethod
+    def __convolver(kernel: np.ndarray):
+        parity = symmetry(kernel)
+        if parity:
+            return LinearPhaseConvolver(kernel, parity)
+        return StreamingConvolver(kernel)
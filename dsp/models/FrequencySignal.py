@@ -1,6 +1,8 @@
 import math
 from typing import Any, List, Literal, Union
 
+import numpy as np
+
 from matplotlib import pyplot as plt
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
@@ -17,6 +19,9 @@ class FrequencySignal(DigitalSignal):
         "pshift": 2,
     }
 
+    # DFT bin index of every entry when only some bins were evaluated (None: all N bins)
+    bins: List[float] | None = None
+
     def __init__(
         self,
         is_periodic: bool,
@@ -32,6 +37,55 @@ class FrequencySignal(DigitalSignal):
         if self.harmonics:
             self.set_data_from_harmonics(sample_freq or sample_count)
 
+    @staticmethod
+    def from_bins(
+        is_periodic: bool,
+        N: int,
+        bins: List[float],
+        harmonics: List[complex],
+        sample_freq: float | None = None,
+    ):
+        """
+        Create a sparse spectrum holding only some (possibly fractional) bins of an N point DFT.
+        The freq axis holds the frequency each bin was evaluated at, k * sample_freq / N in Hz;
+        unlike a full spectrum it is neither angular nor shifted by one bin.
+
+        @param sample_freq: sampling frequency in Hz
+        @default: N, i.e. frequencies in cycles per signal length (the bin index itself)
+        """
+
+        scale = (sample_freq or N) / N
+        signal = FrequencySignal(
+            is_periodic,
+            len(bins),
+            [
+                [k * scale for k in bins],
+                [abs(h) for h in harmonics],
+                [math.atan2(h.imag, h.real) for h in harmonics],
+            ],
+        )
+        signal.harmonics = list(harmonics)
+        signal.bins = list(bins)
+
+        return signal
+
+    @staticmethod
+    def from_response(freq, response):
+        """
+        Create the frequency response of a filter, as returned by `frequency_response`.
+        Unlike a spectrum, the freq axis holds the given frequencies in Hz.
+        """
+
+        response = np.asarray(response, dtype=complex)
+        signal = FrequencySignal(
+            False,
+            len(response),
+            [np.asarray(freq, dtype=float).tolist(), np.abs(response).tolist(), np.angle(response).tolist()],
+        )
+        signal.harmonics = response.tolist()
+
+        return signal
+
     def set_data_from_harmonics(self, sample_freq: float):
         assert self.harmonics is not None
 
@@ -74,6 +128,34 @@ class FrequencySignal(DigitalSignal):
 
         return new_signal
 
+    def apply(self, fil):
+        """
+        Filter the spectrum by multiplying every bin with the filter's n point DFT (`FirFilter.spectrum`)
+
+        This is a circular convolution over the N samples of the signal. It equals the linear
+        `fil.apply` of the time signal when that signal was zero padded to at least
+        len + fil.coefficient_count - 1 samples before the transform; the output samples at
+        negative times then sit at the end of the N samples.
+        """
+
+        if not callable(getattr(fil, "spectrum", None)):
+            raise TypeError(f"{type(fil).__name__} has no n point DFT to filter a spectrum with")
+        if self.bins is not None:
+            raise ValueError("Cannot filter a spectrum that only holds some of the bins")
+
+        if self.harmonics is not None:
+            harmonics = np.asarray(self.harmonics, dtype=complex)
+        else:
+            _, amp, pshift = self.signal_data
+            harmonics = np.asarray(amp, dtype=float) * np.exp(1j * np.asarray(pshift, dtype=float))
+
+        new_signal = FrequencySignal(
+            self.is_periodic, self.sample_count, harmonics=(harmonics * fil.spectrum(self.sample_count)).tolist()
+        )
+        new_signal.signal_data[0] = list(self["freq"])
+
+        return new_signal
+
     def conjugate(self):
         assert self.harmonics is not None
 
@@ -123,19 +205,14 @@ class FrequencySignal(DigitalSignal):
     def __mul__(self, factor: "float | FrequencySignal") -> "FrequencySignal":
         assert self.harmonics is not None
 
-        print("\nharmonics", self.harmonics)
-
         if isinstance(factor, float):
             new_harmonics = [h * factor for h in self.harmonics]
         elif isinstance(factor, FrequencySignal):
             assert factor.harmonics is not None
-            print("factor harmonicx", factor.harmonics)
             new_harmonics = [h1 * h2 for h1, h2 in zip(self.harmonics, factor.harmonics)]
         else:
             raise TypeError("Unsupported type for multiplication of FrequencySignal")
 
-        print("new harmonics", new_harmonics)
-
         return FrequencySignal(
             self.is_periodic, self.sample_count, harmonics=new_harmonics
         )
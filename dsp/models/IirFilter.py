@@ -0,0 +1,258 @@
+"""
+IirFilter module
+
+Contains an IIR filter designed from the same specification as `FirFilter`
+(filter type, cutoff(s), stopband attenuation and transition band, all in Hz / dB).
+
+The design follows the classic analog route: the lowest order Butterworth or Chebyshev (type I)
+low pass prototype that meets the spec, a frequency transformation to the requested type, and the
+bilinear transform with prewarped band edges. The result is stored as a cascade of second-order
+sections, which stays numerically stable at any order.
+
+As for `FirFilter`, `cutoff` / `lowcutoff` / `highcutoff` are passband edges and the stopband
+starts one transition band further out (further in for band stop).
+"""
+
+import math
+from typing import List, Literal, Tuple
+
+import numpy as np
+
+from dsp.enums.filter_type import FILTER_TYPE
+from dsp.utils.biquad import BiquadCascade, sos_response
+
+
+class IirFilter:
+    def __init__(
+        self,
+        filter_type: FILTER_TYPE,
+        sampling_frequency: int,
+        stopband_attenuation: float,
+        transition_band: float,
+        cutoff: float | None = None,
+        highcutoff: float | None = None,
+        lowcutoff: float | None = None,
+        design: Literal["butterworth", "chebyshev"] = "butterworth",
+        passband_ripple: float = 1.0,
+    ) -> None:
+        """
+        @param design: "butterworth" (flat passband) or "chebyshev" (equiripple passband, lower order)
+        @param passband_ripple: largest attenuation allowed in the passband, in dB
+        """
+
+        if design not in ("butterworth", "chebyshev"):
+            raise ValueError(f"Unknown IIR design '{design}'")
+        if passband_ripple <= 0 or stopband_attenuation <= passband_ripple:
+            raise ValueError("Stopband attenuation must be greater than the passband ripple (> 0)")
+
+        self.filter_type = filter_type
+        self.sampling_frequency = sampling_frequency
+        self.stopband_attenuation = stopband_attenuation
+        self.transition_band = transition_band
+        self.design = design
+        self.passband_ripple = passband_ripple
+
+        if filter_type in (FILTER_TYPE.LOW_PASS, FILTER_TYPE.HIGH_PASS):
+            if cutoff is None:
+                raise ValueError("Cutoff frequency must be provided")
+            self.cutoff = cutoff
+            passband = [cutoff]
+            sign = 1 if filter_type == FILTER_TYPE.LOW_PASS else -1
+            stopband = [cutoff + sign * transition_band]
+        elif filter_type in (FILTER_TYPE.BAND_PASS, FILTER_TYPE.BAND_STOP):
+            if lowcutoff is None or highcutoff is None:
+                raise ValueError("Low and high cutoff frequencies must be provided")
+            self.lowcutoff = lowcutoff
+            self.highcutoff = highcutoff
+            passband = [lowcutoff, highcutoff]
+            sign = 1 if filter_type == FILTER_TYPE.BAND_STOP else -1
+            stopband = [lowcutoff + sign * transition_band, highcutoff - sign * transition_band]
+        else:
+            raise ValueError("Invalid filter type")
+
+        edges = [f / sampling_frequency for f in passband + stopband]
+        if not all(0 < f < 0.5 for f in edges) or (len(stopband) == 2 and stopband[0] >= stopband[1]):
+            raise ValueError("Band edges must lie strictly between 0 and half the sampling frequency")
+
+        # prewarped analog band edges, for the bilinear transform s = (z - 1) / (z + 1)
+        self.passband = [math.tan(math.pi * f / sampling_frequency) for f in passband]
+        self.stopband = [math.tan(math.pi * f / sampling_frequency) for f in stopband]
+
+        self.order = self.get_order()
+        z, p, k = self.get_prototype()
+        z, p, k = self.transform(z, p, k)
+        self.sos = IirFilter.zpk_to_sos(*IirFilter.bilinear(z, p, k))
+
+    # region: Design
+    def get_order(self) -> int:
+        """
+        Lowest prototype order meeting the passband ripple and stopband attenuation
+        """
+
+        # stopband edge of the equivalent low pass prototype (passband edge at 1)
+        if self.filter_type == FILTER_TYPE.LOW_PASS:
+            selectivity = self.stopband[0] / self.passband[0]
+        elif self.filter_type == FILTER_TYPE.HIGH_PASS:
+            selectivity = self.passband[0] / self.stopband[0]
+        else:
+            w0_sq = self.passband[0] * self.passband[1]
+            bw = self.passband[1] - self.passband[0]
+            if self.filter_type == FILTER_TYPE.BAND_PASS:
+                selectivity = min(abs(ws**2 - w0_sq) / (ws * bw) for ws in self.stopband)
+            else:
+                selectivity = min(ws * bw / abs(w0_sq - ws**2) for ws in self.stopband)
+
+        ratio = (10 ** (self.stopband_attenuation / 10) - 1) / (10 ** (self.passband_ripple / 10) - 1)
+        if self.design == "butterworth":
+            order = math.log10(ratio) / (2 * math.log10(selectivity))
+        else:
+            order = math.acosh(math.sqrt(ratio)) / math.acosh(selectivity)
+
+        # a hair of tolerance keeps exact fits from rounding up
+        return max(1, math.ceil(order - 1e-9))
+
+    def get_prototype(self) -> Tuple[np.ndarray, np.ndarray, float]:
+        """
+        Zeros, poles and gain of the low pass prototype with its passband edge at 1 rad/s
+        """
+
+        N = self.order
+        eps_sq = 10 ** (self.passband_ripple / 10) - 1
+
+        if self.design == "butterworth":
+            # the 3 dB point is placed so the passband edge is exactly passband_ripple dB down
+            wc = eps_sq ** (-1 / (2 * N))
+            p = wc * np.exp(1j * np.pi * (2 * np.arange(N) + N + 1) / (2 * N))
+            k = wc**N
+        else:
+            mu = math.asinh(1 / math.sqrt(eps_sq)) / N
+            theta = np.pi * (2 * np.arange(N) + 1) / (2 * N)
+            p = -math.sinh(mu) * np.sin(theta) + 1j * math.cosh(mu) * np.cos(theta)
+            k = float(np.real(np.prod(-p)))
+            if N % 2 == 0:
+                # even orders start at the bottom of the ripple
+                k /= math.sqrt(1 + eps_sq)
+
+        return np.zeros(0, dtype=complex), p, k
+
+    def transform(self, z: np.ndarray, p: np.ndarray, k: float):
+        """
+        Turn the low pass prototype into the requested filter type at the prewarped band edges
+        """
+
+        degree = len(p) - len(z)
+
+        if self.filter_type == FILTER_TYPE.LOW_PASS:
+            w = self.passband[0]
+            return z * w, p * w, k * w**degree
+
+        if self.filter_type == FILTER_TYPE.HIGH_PASS:
+            w = self.passband[0]
+            k *= float(np.real(np.prod(-z) / np.prod(-p)))
+            return np.concatenate([w / z, np.zeros(degree)]), w / p, k
+
+        w0 = math.sqrt(self.passband[0] * self.passband[1])
+        bw = self.passband[1] - self.passband[0]
+
+        def split(roots: np.ndarray) -> np.ndarray:
+            # each root r becomes the two roots of s^2 - r s + w0^2
+            root = np.sqrt(roots**2 - w0**2 + 0j)
+            return np.concatenate([roots + root, roots - root])
+
+        if self.filter_type == FILTER_TYPE.BAND_PASS:
+            zeros = np.concatenate([split(z * bw / 2), np.zeros(degree)])
+            return zeros, split(p * bw / 2), k * bw**degree
+
+        k *= float(np.real(np.prod(-z) / np.prod(-p)))
+        notches = np.full(degree, 1j * w0)
+        zeros = np.concatenate([split(bw / 2 / z), notches, np.conj(notches)])
+        return zeros, split(bw / 2 / p), k
+
+    @staticmethod
+    def bilinear(z: np.ndarray, p: np.ndarray, k: float):
+        """
+        Map an analog filter onto the z plane with s = (z - 1) / (z + 1)
+        """
+
+        degree = len(p) - len(z)
+        k *= float(np.real(np.prod(1 - z) / np.prod(1 - p)))
+        zeros = np.concatenate([(1 + z) / (1 - z), -np.ones(degree)])
+        return zeros, (1 + p) / (1 - p), k
+
+    @staticmethod
+    def zpk_to_sos(z: np.ndarray, p: np.ndarray, k: float) -> np.ndarray:
+        """
+        Group conjugate roots into second-order sections, each pole pair with the nearest zero pair.
+        The gain goes to the first section.
+        """
+
+        def pairs(roots: np.ndarray) -> List[np.ndarray]:
+            roots = np.asarray(roots, dtype=complex)
+            tol = 1e-9 * max(1.0, float(np.max(np.abs(roots), initial=0)))
+            complex_roots = sorted(roots[roots.imag > tol], key=lambda r: r.real)
+            real_roots = sorted(roots[np.abs(roots.imag) <= tol].real)
+
+            grouped = [np.array([r, np.conj(r)]) for r in complex_roots]
+            grouped += [np.array(real_roots[i : i + 2], dtype=complex) for i in range(0, len(real_roots), 2)]
+            return grouped
+
+        pole_pairs = pairs(p)
+        zero_pairs = pairs(z)
+        if len(zero_pairs) != len(pole_pairs):
+            raise ValueError("Zeros and poles can't be paired into second-order sections")
+
+        # poles closest to the unit circle first, they need their zeros the most
+        pole_pairs.sort(key=lambda pair: -np.max(np.abs(pair)))
+
+        sos = []
+        for poles in pole_pairs:
+            nearest = min(
+                range(len(zero_pairs)),
+                key=lambda i: (len(zero_pairs[i]) != len(poles), np.min(np.abs(zero_pairs[i][0] - poles))),
+            )
+            zeros = zero_pairs.pop(nearest)
+
+            b = np.real(np.poly(zeros))
+            a = np.real(np.poly(poles))
+            sos.append(np.concatenate([np.pad(b, (0, 3 - len(b))), np.pad(a, (0, 3 - len(a)))]))
+
+        sos = np.array(sos)
+        sos[0, :3] *= k
+        return sos
+    # endregion
+
+    def frequency_response(self, n_points: int = 4097):
+        """
+        Magnitude and phase on n_points frequencies evenly spaced from 0 to fs / 2, as
+        `FirFilter.frequency_response`, evaluated exactly from the second-order sections
+
+        @return: FrequencySignal with the frequency (in Hz) on the freq axis, the magnitude on the
+        amp axis and the phase on the pshift axis
+        """
+
+        from dsp.models.FrequencySignal import FrequencySignal
+
+        if n_points < 2:
+            raise ValueError("At least 2 frequency points are needed")
+
+        freq = np.linspace(0, 0.5, n_points)
+        return FrequencySignal.from_response(freq * self.sampling_frequency, sos_response(self.sos, freq))
+
+    def stream(self):
+        """
+        Create a stateful filter that applies the cascade chunk by chunk.
+        Feeding every chunk of a signal through `process` gives the same samples as `apply`.
+        """
+
+        return BiquadCascade(self.sos)
+
+    def apply(self, signal):
+        """
+        Apply the filter on the input signal x. The output keeps the time axis of the input
+        (the impulse response never ends, so it isn't extended like a convolution).
+        """
+
+        from dsp.models.TimeSignal import TimeSignal
+
+        amp = self.stream().process(signal["amp"][: len(signal)])
+        return TimeSignal(signal.is_periodic, len(amp), [list(signal["time"][: len(amp)]), amp.tolist()])
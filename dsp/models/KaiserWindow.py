@@ -0,0 +1,51 @@
+"""
+KaiserWindow module
+
+Kaiser window designed for a given stopband attenuation.
+Unlike the fixed windows, whose attenuation is set by their shape, the Kaiser window trades main
+lobe width for side lobe level through its β parameter, so a filter gets exactly the attenuation it
+asks for with the fewest taps (Kaiser's design formulas, A in dB and Δf normalized):
+
+    β = 0.1102 (A - 8.7)                           A > 50
+    β = 0.5842 (A - 21)^0.4 + 0.07886 (A - 21)     21 <= A <= 50
+    β = 0                                          A < 21
+    N = (A - 7.95) / (14.36 Δf) + 1
+"""
+
+import math
+
+import numpy as np
+
+from dsp.models.Window import Window
+
+
+class KaiserWindow(Window):
+    def __init__(self, stopbandAttenuation: float) -> None:
+        self.beta = KaiserWindow.get_beta(stopbandAttenuation)
+
+        super().__init__(
+            fn=self.__fn,
+            stopbandAttenuation=stopbandAttenuation,
+            transitionWidthFactor=max(0.0, (stopbandAttenuation - 7.95) / 14.36),
+            name="Kaiser",
+        )
+
+    @staticmethod
+    def get_beta(attenuation: float) -> float:
+        if attenuation > 50:
+            return 0.1102 * (attenuation - 8.7)
+        if attenuation >= 21:
+            return 0.5842 * (attenuation - 21) ** 0.4 + 0.07886 * (attenuation - 21)
+        return 0.0
+
+    def __fn(self, n, N: int):
+        if N == 1:
+            return np.ones(np.shape(n))
+
+        ratio = 2 * np.asarray(n, dtype=float) / (N - 1)
+        return np.i0(self.beta * np.sqrt(np.clip(1 - ratio**2, 0, None))) / np.i0(self.beta)
+
+    def getCoefficientCount(self, transitionBand: float):
+        res = math.ceil(self.transitionWidthFactor / transitionBand) + 1
+        res = res + 1 if res % 2 == 0 else res
+        return res
@@ -0,0 +1,204 @@
+"""
+Pipeline module
+
+Runs a declarative chain of processing stages over a signal as a stream.
+
+A pipeline spec is a JSON or TOML document holding a list of stages, e.g.
+
+    {
+        "chunk_size": 4096,
+        "stages": [
+            {"op": "read", "path": "data/ecg.txt"},
+            {"op": "remove_dc"},
+            {"op": "filter", "filter_type": "BAND_PASS", "sampling_frequency": 1000,
+             "lowcutoff": 150, "highcutoff": 250,
+             "stopband_attenuation": 60, "transition_band": 50, "block_size": 256},
+            {"op": "filter", "filter_type": "LOW_PASS", "sampling_frequency": 1000, "cutoff": 200,
+             "stopband_attenuation": 40, "transition_band": 50, "design": "butterworth"},
+            {"op": "resample", "m": 2, "L": 3, "filter": {...}},
+            {"op": "quantize", "bits": 3},
+            {"op": "save", "path": "out.txt"}
+        ]
+    }
+
+Every stage name maps onto the matching `TimeSignal` / `FirFilter` / quantizer operation;
+a filter stage with a `design` runs an `IirFilter` instead.
+Stages are chained as `SignalStream`s, so no intermediate signal is ever materialized in full.
+"""
+
+import json
+from typing import Any, Callable, Dict, List
+
+from dsp.enums.filter_type import FILTER_TYPE
+from dsp.models.Filter import FirFilter
+from dsp.models.IirFilter import IirFilter
+from dsp.models.SignalStream import DEFAULT_CHUNK_SIZE, SignalStream
+from dsp.models.TimeSignal import TimeSignal
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+
+def _filter_params(spec: Dict[str, Any]):
+    params = dict(spec)
+    params.pop("op", None)
+
+    filter_type = params.pop("filter_type", None)
+    if filter_type is None:
+        raise ValueError("Filter spec must provide a filter_type")
+    if isinstance(filter_type, str):
+        try:
+            filter_type = FILTER_TYPE[filter_type.upper()]
+        except KeyError:
+            raise ValueError(f"Unknown filter type '{filter_type}'")
+
+    return filter_type, params
+
+
+def build_filter(spec: Dict[str, Any]) -> FirFilter:
+    """
+    Create a FirFilter from a spec dict holding the same keyword arguments as its constructor.
+    `filter_type` may be given as a FILTER_TYPE name (e.g. "LOW_PASS").
+    """
+
+    filter_type, params = _filter_params(spec)
+    return FirFilter(filter_type, **params)
+
+
+def build_iir_filter(spec: Dict[str, Any]) -> IirFilter:
+    """
+    Create an IirFilter from a spec dict, as `build_filter`
+    """
+
+    filter_type, params = _filter_params(spec)
+    return IirFilter(filter_type, **params)
+
+
+def _quantize(stream: SignalStream, bits: int | None = None, levels: int | None = None):
+    if (bits is None) == (levels is None):
+        raise ValueError("Quantize stage needs exactly one of bits or levels")
+
+    return stream.quantize_w_bits(bits) if bits is not None else stream.quantize_w_levels(levels)  # type: ignore
+
+
+def _filter(stream: SignalStream, block_size: int | None = None, **spec: Any):
+    fil = build_iir_filter(spec) if "design" in spec else build_filter(spec)
+    return stream.apply(fil, block_size)
+
+
+def _resample(stream: SignalStream, filter: Dict[str, Any], m: int = 0, L: int = 0):
+    return stream.resample(m, L, build_filter(filter))
+
+
+def _upsample(stream: SignalStream, filter: Dict[str, Any], L: int):
+    return stream.upsample(L, build_filter(filter))
+
+
+def _downsample(stream: SignalStream, M: int, filter: Dict[str, Any] | None = None):
+    return stream.downsample(M, build_filter(filter) if filter else None)
+
+
+STAGES: Dict[str, Callable[..., SignalStream]] = {
+    "remove_dc": lambda stream: stream.remove_dc(),
+    "normalize": lambda stream: stream.normalize(),
+    "multiply": lambda stream, factor: stream * factor,
+    "convolve": lambda stream, coefficients, start=0: stream.convolve(coefficients, start),
+    "filter": _filter,
+    "upsample": _upsample,
+    "downsample": _downsample,
+    "resample": _resample,
+    "quantize": _quantize,
+}
+
+
+class Pipeline:
+    def __init__(self, stages: List[Dict[str, Any]], chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self.chunk_size = chunk_size
+        self.source: str | None = None
+        self.destination: str | None = None
+        self.stages: List[Dict[str, Any]] = []
+
+        for i, stage in enumerate(stages):
+            op = stage.get("op")
+
+            if op == "read":
+                if i != 0:
+                    raise ValueError("'read' must be the first stage")
+                self.source = stage["path"]
+            elif op == "save":
+                if i != len(stages) - 1:
+                    raise ValueError("'save' must be the last stage")
+                self.destination = stage["path"]
+            elif op in STAGES:
+                self.stages.append(stage)
+            else:
+                raise ValueError(f"Unknown pipeline stage '{op}'")
+
+    @staticmethod
+    def from_spec(spec: Dict[str, Any]):
+        if "stages" not in spec:
+            raise ValueError("Pipeline spec must contain a list of stages")
+
+        return Pipeline(spec["stages"], spec.get("chunk_size", DEFAULT_CHUNK_SIZE))
+
+    @staticmethod
+    def load(path: str):
+        """
+        Load a pipeline spec from a .json or .toml file
+        """
+
+        if path.endswith(".toml"):
+            if tomllib is None:
+                raise ValueError("TOML pipeline specs require Python 3.11 or newer")
+            with open(path, "rb") as file:
+                return Pipeline.from_spec(tomllib.load(file))
+
+        with open(path, "r") as file:
+            return Pipeline.from_spec(json.load(file))
+
+    def build(self, source: SignalStream) -> SignalStream:
+        """
+        Chain every stage onto the source stream. Nothing is computed until the result is iterated.
+        """
+
+        stream = source
+        for stage in self.stages:
+            params = dict(stage)
+            op = params.pop("op")
+            stream = STAGES[op](stream, **params)
+
+        return stream
+
+    def run(
+        self,
+        source: "str | TimeSignal | None" = None,
+        destination: str | None = None,
+    ):
+        """
+        Execute the pipeline.
+
+        @param source: input file path or TimeSignal, defaults to the spec's "read" stage
+        @param destination: output file path, defaults to the spec's "save" stage
+        @return: the resulting TimeSignal if there is no destination, otherwise None
+        """
+
+        source = source if source is not None else self.source
+        destination = destination or self.destination
+
+        if source is None:
+            raise ValueError("Pipeline has no input signal")
+
+        if isinstance(source, TimeSignal):
+            stream = SignalStream.from_signal(source, self.chunk_size)
+        else:
+            stream = SignalStream.read(source, self.chunk_size)
+
+        result = self.build(stream)
+
+        if destination:
+            result.save(destination)
+            return None
+
+        return result.to_signal()
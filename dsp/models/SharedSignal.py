@@ -0,0 +1,145 @@
+"""
+SharedSignal module
+
+Contains a time domain signal stored in a `multiprocessing.shared_memory` block.
+Instead of pickling a TimeSignal (nested python lists) for every worker, the parent process
+places the amplitudes in shared memory once and sends the small, picklable `descriptor`.
+Workers `attach` to the descriptor and get a numpy view of the same memory, without copying.
+
+Lifetime: only the process that created a block owns it and unlinks it (on `unlink`, when the
+owner is garbage collected, or at interpreter exit). Attached workers only map the block, so a
+crashing worker cannot leak it; if the owner itself crashes, multiprocessing's resource tracker
+unlinks the segments it registered.
+"""
+
+import sys
+import weakref
+from multiprocessing import shared_memory
+from typing import NamedTuple
+
+import numpy as np
+
+from dsp.models.TimeSignal import TimeSignal
+
+
+class SharedSignalDescriptor(NamedTuple):
+    name: str
+    sample_count: int
+    start_time: int
+    is_periodic: bool
+
+
+def _release(shm: shared_memory.SharedMemory, owner: bool):
+    try:
+        shm.close()
+    except BufferError:
+        # a numpy view of the block is still alive, the mapping goes away with the process
+        pass
+
+    if owner:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedSignal:
+    def __init__(
+        self,
+        shm: shared_memory.SharedMemory,
+        descriptor: SharedSignalDescriptor,
+        owner: bool,
+    ) -> None:
+        self.shm = shm
+        self.descriptor = descriptor
+        self.owner = owner
+        self.amp: np.ndarray = np.ndarray(
+            (descriptor.sample_count,), dtype=np.float64, buffer=shm.buf
+        )
+        self.__finalizer = weakref.finalize(self, _release, shm, owner)
+
+    @property
+    def start_time(self):
+        return self.descriptor.start_time
+
+    @property
+    def sample_count(self):
+        return self.descriptor.sample_count
+
+    @property
+    def is_periodic(self):
+        return self.descriptor.is_periodic
+
+    def __len__(self):
+        return self.sample_count
+
+    @staticmethod
+    def create(sample_count: int, start_time: int = 0, is_periodic: bool = False):
+        """
+        Allocate a zero filled shared block, e.g. as an output buffer for workers to fill in place.
+        """
+
+        # shared memory blocks can't be empty
+        shm = shared_memory.SharedMemory(create=True, size=max(sample_count, 1) * 8)
+        signal = SharedSignal(
+            shm,
+            SharedSignalDescriptor(shm.name, sample_count, start_time, is_periodic),
+            owner=True,
+        )
+        signal.amp[:] = 0.0
+        return signal
+
+    @staticmethod
+    def from_signal(signal: TimeSignal):
+        shared = SharedSignal.create(
+            signal.sample_count, int(signal["time"][0]), signal.is_periodic
+        )
+        shared.amp[:] = signal["amp"][: signal.sample_count]
+        return shared
+
+    @staticmethod
+    def attach(descriptor: SharedSignalDescriptor):
+        """
+        Map an existing block in this process. The returned signal never unlinks the block.
+        """
+
+        if sys.version_info >= (3, 13):
+            # don't let this process' resource tracker claim a block it doesn't own
+            shm = shared_memory.SharedMemory(descriptor.name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(descriptor.name)
+
+        return SharedSignal(shm, descriptor, owner=False)
+
+    def to_signal(self):
+        """
+        Copy the shared amplitudes into a regular TimeSignal
+        """
+
+        return TimeSignal(
+            self.is_periodic,
+            self.sample_count,
+            [
+                list(range(self.start_time, self.start_time + self.sample_count)),
+                self.amp.tolist(),
+            ],
+        )
+
+    def close(self):
+        """
+        Release this process' mapping; the owner also unlinks the block.
+        Numpy views taken from `amp` must not be used afterwards.
+        """
+
+        del self.amp
+        self.__finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __reduce__(self):
+        # sending a SharedSignal to another process only sends its descriptor
+        return SharedSignal.attach, (self.descriptor,)
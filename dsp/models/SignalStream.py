@@ -0,0 +1,346 @@
+"""
+SignalStream module
+
+Contains a lazy, chunked representation of a time domain signal.
+A SignalStream never holds the whole signal in memory: every operation returns a new
+stream that transforms the chunks of its source on the fly, and the chunks are only
+produced when the stream is iterated (e.g. by `save` or `to_signal`).
+
+Operations that need global statistics (remove_dc, normalize, quantization) compute
+them with an extra pass over their source instead of materializing it.
+"""
+
+import math
+from typing import Callable, Iterator, List, Tuple
+
+import numpy as np
+
+from dsp.enums.signal_domain import SIGNAL_DOMAIN
+from dsp.models.Filter import FirFilter
+from dsp.models.IirFilter import IirFilter
+from dsp.models.TimeSignal import TimeSignal
+from dsp.utils.convolution import StreamingConvolver
+
+DEFAULT_CHUNK_SIZE = 4096
+
+
+class SignalStream:
+    def __init__(
+        self,
+        is_periodic: bool,
+        sample_count: int,
+        start_time: int,
+        chunks: Callable[[], Iterator[np.ndarray]],
+    ) -> None:
+        """
+        @param chunks: factory returning a fresh iterator over the amplitude chunks.
+        It is called once per pass, so a stream can be iterated more than once.
+        """
+
+        self.is_periodic = is_periodic
+        self.sample_count = sample_count
+        self.start_time = start_time
+        self.chunks = chunks
+        self.__stats: Tuple[float, float, float] | None = None
+
+    def __iter__(self):
+        return self.chunks()
+
+    def __len__(self):
+        return self.sample_count
+
+    # region: Sources
+    @staticmethod
+    def from_signal(signal: TimeSignal, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        amp = np.asarray(signal["amp"][: signal.sample_count], dtype=float)
+
+        def chunks():
+            for i in range(0, len(amp), chunk_size):
+                yield amp[i : i + chunk_size]
+
+        return SignalStream(
+            signal.is_periodic, len(amp), int(signal["time"][0]), chunks
+        )
+
+    @staticmethod
+    def read(path: str | None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Open a time domain signal file (same format as `DigitalSignal.read`) as a stream.
+        Only the header and first sample are read up front.
+        """
+
+        if not path:
+            raise ValueError("Path must be provided")
+
+        with open(path, "r") as file:
+            signal_domain = int(file.readline())
+            is_periodic = int(file.readline()) == 1
+            sample_count = int(file.readline())
+            first_record = file.readline().split()
+
+        if signal_domain != SIGNAL_DOMAIN.TIME.value:
+            raise ValueError("Only time domain signals can be streamed")
+
+        start_time = int(float(first_record[0])) if first_record else 0
+
+        def chunks():
+            with open(path, "r") as file:
+                for _ in range(3):
+                    file.readline()
+
+                buffer: List[float] = []
+                for line in file:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    buffer.append(float(line.split(" ")[-1]))
+                    if len(buffer) == chunk_size:
+                        yield np.array(buffer)
+                        buffer = []
+
+                if buffer:
+                    yield np.array(buffer)
+
+        return SignalStream(is_periodic, sample_count, start_time, chunks)
+    # endregion
+
+    # region: Sinks
+    def save(self, path: str):
+        with open(path, "+w") as file:
+            file.write(f"{SIGNAL_DOMAIN.TIME.value}\n")
+            file.write(f"{1 if self.is_periodic else 0}\n")
+            file.write(f"{self.sample_count}\n")
+
+            t = self.start_time
+            for chunk in self:
+                file.write(
+                    "".join(f"{t + i} {x}\n" for i, x in enumerate(chunk.tolist()))
+                )
+                t += len(chunk)
+
+    def to_signal(self):
+        amp: List[float] = []
+        for chunk in self:
+            amp.extend(chunk.tolist())
+
+        return TimeSignal(
+            self.is_periodic,
+            len(amp),
+            [list(range(self.start_time, self.start_time + len(amp))), amp],
+        )
+
+    def stats(self):
+        """
+        Return (mean, min, max) of the stream, computed in a single pass over its source.
+        """
+
+        if self.__stats is None:
+            count = 0
+            total = 0.0
+            min_val = math.inf
+            max_val = -math.inf
+
+            for chunk in self:
+                if len(chunk) == 0:
+                    continue
+                count += len(chunk)
+                total += float(chunk.sum())
+                min_val = min(min_val, float(chunk.min()))
+                max_val = max(max_val, float(chunk.max()))
+
+            if count == 0:
+                raise ValueError("Cannot compute statistics of an empty signal")
+
+            self.__stats = (total / count, min_val, max_val)
+
+        return self.__stats
+    # endregion
+
+    # region: Operations
+    def map(self, fn: Callable[[np.ndarray], np.ndarray]):
+        """
+        Apply an element-wise function to every chunk.
+        """
+
+        source = self
+
+        def chunks():
+            for chunk in source:
+                yield fn(chunk)
+
+        return SignalStream(self.is_periodic, self.sample_count, self.start_time, chunks)
+
+    def __mul__(self, scalar: float):
+        return self.map(lambda chunk: chunk * scalar)
+
+    def square(self):
+        return self.map(lambda chunk: chunk**2)
+
+    def cumulative_sum(self):
+        source = self
+
+        def chunks():
+            total = 0.0
+            for chunk in source:
+                if len(chunk) == 0:
+                    continue
+                out = np.cumsum(chunk) + total
+                total = float(out[-1])
+                yield out
+
+        return SignalStream(self.is_periodic, self.sample_count, self.start_time, chunks)
+
+    def remove_dc(self):
+        source = self
+
+        def chunks():
+            mean, _, _ = source.stats()
+            for chunk in source:
+                yield chunk - mean
+
+        return SignalStream(self.is_periodic, self.sample_count, self.start_time, chunks)
+
+    def normalize(self):
+        source = self
+
+        def chunks():
+            _, min_val, max_val = source.stats()
+            max_abs = max(abs(min_val), abs(max_val))
+            for chunk in source:
+                yield chunk / max_abs
+
+        return SignalStream(self.is_periodic, self.sample_count, self.start_time, chunks)
+
+    def convolve(self, coefficients: List[float], coefficients_start: int = 0):
+        """
+        Stream the linear convolution with a short kernel (same result as `TimeSignal.convolve`).
+        """
+
+        source = self
+        kernel = np.asarray(coefficients, dtype=float)
+
+        def chunks():
+            convolver = StreamingConvolver(kernel)
+            for chunk in source:
+                yield convolver.process(chunk)
+            yield convolver.flush()
+
+        return SignalStream(
+            self.is_periodic,
+            self.sample_count + len(kernel) - 1,
+            min(self.start_time, coefficients_start),
+            chunks,
+        )
+
+    def apply(self, fil: FirFilter | IirFilter, block_size: int | None = None):
+        """
+        Filter the stream. An IirFilter keeps the time axis of the input, as `IirFilter.apply` does.
+
+        @param block_size: filter with a `PartitionedConvolver` of this latency (FIR filters only)
+        """
+
+        source = self
+
+        if isinstance(fil, IirFilter):
+            if block_size is not None:
+                raise ValueError("block_size only applies to FIR filters")
+
+            def iir_chunks():
+                cascade = fil.stream()
+                for chunk in source:
+                    yield cascade.process(chunk)
+
+            return SignalStream(self.is_periodic, self.sample_count, self.start_time, iir_chunks)
+
+        m = (fil.coefficient_count - 1) // 2
+
+        def chunks():
+            convolver = fil.stream(block_size)
+            for chunk in source:
+                yield convolver.process(chunk)
+            yield convolver.flush()
+
+        return SignalStream(
+            self.is_periodic,
+            self.sample_count + fil.coefficient_count - 1,
+            min(self.start_time, -m),
+            chunks,
+        )
+
+    def upsample(self, L: int, fil: FirFilter):
+        if L == 0:
+            return self
+
+        source = self
+        stuffed_count = self.sample_count * L - L + 1
+
+        def chunks():
+            remaining = stuffed_count
+            for chunk in source:
+                stuffed = np.zeros(len(chunk) * L)
+                stuffed[::L] = chunk
+                stuffed = stuffed[:remaining]
+                remaining -= len(stuffed)
+                yield stuffed
+
+        stuffed = SignalStream(self.is_periodic, stuffed_count, self.start_time, chunks)
+        return stuffed.apply(fil)
+
+    def downsample(self, M: int, fil: FirFilter | None = None):
+        if M == 0:
+            return self
+
+        source = self.apply(fil) if fil else self
+        new_size = len(source) // M
+
+        def chunks():
+            position = 0
+            remaining = new_size
+            for chunk in source:
+                # index of the first sample in this chunk that lands on the M grid
+                offset = (-position) % M
+                position += len(chunk)
+                kept = chunk[offset::M][:remaining]
+                remaining -= len(kept)
+                yield kept
+
+        return SignalStream(self.is_periodic, new_size, source.start_time, chunks)
+
+    def resample(self, m: int, L: int, fil: FirFilter):
+        if m == 0 and L == 0:
+            raise ValueError("At least one of m or L must be greater than 0")
+
+        if m == 0 and L != 0:
+            return self.upsample(L, fil)
+
+        if L == 0 and m != 0:
+            return self.downsample(m, fil)
+
+        return self.upsample(L, fil).downsample(m)
+
+    def quantize(self, level_count: int):
+        """
+        Replace every sample by the midpoint of its quantization level.
+        Same levels as `TimeSignal.quantize_w_levels`, with min/max taken from a first pass.
+        """
+
+        source = self
+
+        def chunks():
+            _, min_val, max_val = source.stats()
+            step = (max_val - min_val) / level_count
+            levels = np.array([min_val + step * i for i in range(level_count + 1)])
+            midpoints = (levels[:-1] + levels[1:]) / 2
+
+            for chunk in source:
+                level = np.searchsorted(levels[1:level_count], chunk, side="right")
+                yield midpoints[level]
+
+        return SignalStream(self.is_periodic, self.sample_count, self.start_time, chunks)
+
+    def quantize_w_levels(self, level_count: int):
+        return self.quantize(level_count)
+
+    def quantize_w_bits(self, bit_count: int):
+        return self.quantize(2**bit_count)
+    # endregion
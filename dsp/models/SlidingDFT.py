@@ -0,0 +1,141 @@
+"""
+SlidingDFT module
+
+Keeps the DFT of the last N samples of a stream up to date as new samples arrive.
+Each new sample x_new replacing the oldest sample x_old updates every tracked bin in O(1):
+
+    X_k <- (X_k + x_new - x_old) * e^(j2πk/N)
+
+A block of m new samples is applied at once: X_k <- r^m (X_k + sum_i delta_i r^(-i)) with
+r = e^(j2πk/N) and delta_i = x_new - x_old, the sum being the Goertzel DFT of the deltas. When
+that costs more than recomputing the bins (m K > N log2 N when all N bins are tracked), the
+window is transformed again instead.
+
+Since the update is a rotation of the previous value, rounding errors slowly accumulate;
+every `reanchor_interval` samples the bins are recomputed exactly from the sample buffer.
+"""
+
+import math
+from typing import List
+
+import numpy as np
+
+from dsp.models.FrequencySignal import FrequencySignal
+from dsp.models.TimeSignal import TimeSignal
+from dsp.utils.fourier import goertzel
+
+
+class SlidingDFT:
+    def __init__(
+        self,
+        window: TimeSignal,
+        bins: List[int] | None = None,
+        sampling_freq: float | None = None,
+        reanchor_interval: int | None = None,
+    ) -> None:
+        """
+        @param window: the first N samples; N is the DFT length from then on
+        @param bins: DFT bins to track
+        @default: all N bins
+        @param sampling_freq: same meaning as in `switch_domain`
+        @param reanchor_interval: number of samples between exact recomputations
+        @default: 64 * N
+        """
+
+        self.N = window.sample_count
+        if self.N == 0:
+            raise ValueError("Window must contain at least one sample")
+
+        self.is_periodic = window.is_periodic
+        self.sampling_freq = sampling_freq
+        self.bins = bins
+        self.k = np.arange(self.N) if bins is None else np.asarray(bins)
+        self.reanchor_interval = reanchor_interval or 64 * self.N
+        # rotation of every tracked bin per sample
+        self.r = np.exp(2j * np.pi * self.k / self.N)
+        # cost of recomputing the tracked bins, in the units of the m K cost of sliding by m samples
+        self.reanchor_cost = (
+            self.N * max(1.0, math.log2(self.N)) if bins is None else self.N * len(self.k)
+        )
+
+        # circular buffer of the current window, self.pos is the oldest sample
+        self.buffer = np.asarray(window["amp"][: self.N], dtype=float)
+        self.pos = 0
+        self.since_anchor = 0
+        self.harmonics = self.__exact()
+
+    def __window(self):
+        return np.roll(self.buffer, -self.pos)
+
+    def __exact(self) -> np.ndarray:
+        window = self.__window()
+        if self.bins is None:
+            return np.fft.fft(window)
+
+        return goertzel(window, self.k)
+
+    def reanchor(self):
+        """
+        Recompute the tracked bins exactly from the current window
+        """
+
+        self.harmonics = self.__exact()
+        self.since_anchor = 0
+
+    def push(self, sample: float):
+        self.update([sample])
+
+    def update(self, samples):
+        """
+        Slide the window over new samples
+        """
+
+        samples = np.asarray(samples, dtype=float)
+
+        # within N samples every replaced sample is still in the old window
+        for start in range(0, len(samples), self.N):
+            self.__slide(samples[start : start + self.N])
+
+    def __slide(self, new: np.ndarray):
+        m = len(new)
+        if m == 0:
+            return
+
+        idx = (self.pos + np.arange(m)) % self.N
+        delta = new - self.buffer[idx]
+        self.buffer[idx] = new
+        self.pos = (self.pos + m) % self.N
+        self.since_anchor += m
+
+        if m * len(self.k) > self.reanchor_cost or self.since_anchor >= self.reanchor_interval:
+            self.reanchor()
+        elif m == 1:
+            self.harmonics = (self.harmonics + delta[0]) * self.r
+        else:
+            # after m steps: X = r^m (X + sum_i delta_i r^(-i)), the sum is a DFT of the deltas
+            # at bins k m / N of their own length
+            self.harmonics = self.r**m * (self.harmonics + goertzel(delta, self.k * m / self.N))
+
+    def window(self):
+        """
+        The current window (last N samples) as a TimeSignal
+        """
+
+        return TimeSignal(
+            self.is_periodic, self.N, [list(range(self.N)), self.__window().tolist()]
+        )
+
+    def spectrum(self):
+        """
+        The current spectrum as a FrequencySignal (sparse if only some bins are tracked)
+        """
+
+        harmonics = self.harmonics.tolist()
+        if self.bins is None:
+            return FrequencySignal(
+                self.is_periodic, self.N, harmonics=harmonics, sample_freq=self.sampling_freq
+            )
+
+        return FrequencySignal.from_bins(
+            self.is_periodic, self.N, list(self.bins), harmonics, self.sampling_freq
+        )
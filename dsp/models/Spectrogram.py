@@ -0,0 +1,187 @@
+"""
+Spectrogram module
+
+Contains the short-time Fourier transform (STFT) of a time domain signal and its inverse.
+
+Frames of `frame_length` samples are taken every `hop` samples, multiplied by one of the
+filter design windows (`FirFilter.windows`) and transformed with an `fft_size` point real FFT.
+Frames are computed from a stream as soon as their samples are available and written straight
+into a preallocated output, which can be a memory-mapped .npy file for long recordings.
+"""
+
+import math
+
+import numpy as np
+
+from dsp.models.Filter import FirFilter
+from dsp.models.FrequencySignal import FrequencySignal
+from dsp.models.SignalStream import SignalStream
+from dsp.models.TimeSignal import TimeSignal
+from dsp.models.Window import Window
+from dsp.utils.framing import FRAMES_PER_BLOCK, FrameBuffer
+
+
+class Spectrogram:
+    def __init__(
+        self,
+        data: np.ndarray,
+        frame_length: int,
+        hop: int,
+        fft_size: int,
+        window: np.ndarray,
+        sample_count: int,
+        start_time: int = 0,
+        sampling_freq: float | None = None,
+        is_periodic: bool = False,
+    ) -> None:
+        """
+        @param data: complex array of shape (frames, fft_size // 2 + 1), one spectrum per frame
+        @param sampling_freq: in Hz
+        @default: unknown, frequencies are given in bins and times in samples
+        """
+
+        self.data = data
+        self.frame_length = frame_length
+        self.hop = hop
+        self.fft_size = fft_size
+        self.window = window
+        self.sample_count = sample_count
+        self.start_time = start_time
+        self.sampling_freq = sampling_freq
+        self.is_periodic = is_periodic
+
+    @staticmethod
+    def frame_count(sample_count: int, frame_length: int, hop: int):
+        """
+        Number of frames needed to cover every sample (the last frame is zero padded)
+        """
+
+        if sample_count == 0:
+            return 0
+        return 1 + max(0, math.ceil((sample_count - frame_length) / hop))
+
+    @staticmethod
+    def from_stream(
+        stream: SignalStream,
+        frame_length: int,
+        hop: int | None = None,
+        window: Window | str = "Hanning",
+        fft_size: int | None = None,
+        sampling_freq: float | None = None,
+        out_path: str | None = None,
+    ):
+        """
+        Compute the STFT of a stream, one chunk at a time
+
+        @param hop: samples between the start of two frames
+        @default: frame_length // 2
+        @param window: a Window or the name of one of `FirFilter.windows`
+        @param fft_size: FFT length, frames are zero padded to it
+        @default: frame_length
+        @param out_path: store the spectrogram in a memory-mapped .npy file at this path
+        """
+
+        hop = hop or max(1, frame_length // 2)
+        fft_size = fft_size or frame_length
+        if fft_size < frame_length:
+            raise ValueError("FFT size must be at least the frame length")
+        if isinstance(window, str):
+            window = FirFilter.find_window(window)
+
+        win = np.asarray(window.samples(frame_length), dtype=float)
+
+        n_frames = Spectrogram.frame_count(stream.sample_count, frame_length, hop)
+        shape = (n_frames, fft_size // 2 + 1)
+        if out_path:
+            data = np.lib.format.open_memmap(out_path, mode="w+", dtype=np.complex128, shape=shape)
+        else:
+            data = np.empty(shape, dtype=np.complex128)
+
+        framer = FrameBuffer(frame_length, hop)
+        frame = 0
+
+        def transform(frames: np.ndarray):
+            nonlocal frame
+
+            for i in range(0, len(frames), FRAMES_PER_BLOCK):
+                block = frames[i : i + FRAMES_PER_BLOCK]
+                data[frame : frame + len(block)] = np.fft.rfft(block * win, n=fft_size)
+                frame += len(block)
+
+        for chunk in stream:
+            transform(framer.push(chunk))
+        transform(framer.flush())
+
+        if isinstance(data, np.memmap):
+            data.flush()
+
+        return Spectrogram(
+            data, frame_length, hop, fft_size, win, stream.sample_count,
+            stream.start_time, sampling_freq, stream.is_periodic,
+        )
+
+    def __len__(self):
+        return len(self.data)
+
+    @property
+    def freq(self) -> np.ndarray:
+        """
+        Frequency of every bin in Hz (the bin index without a sampling frequency)
+        """
+
+        return np.arange(self.data.shape[1]) * (self.sampling_freq or self.fft_size) / self.fft_size
+
+    @property
+    def times(self) -> np.ndarray:
+        """
+        Time (in seconds) at the start of every frame, or its sample index without a sampling frequency
+        """
+
+        starts = self.start_time + np.arange(len(self)) * self.hop
+        return starts if self.sampling_freq is None else starts / self.sampling_freq
+
+    @property
+    def amp(self) -> np.ndarray:
+        return np.abs(self.data)
+
+    def frame(self, i: int):
+        """
+        The spectrum of the i-th frame as a (one-sided) FrequencySignal, on the `freq` axis
+        """
+
+        return FrequencySignal.from_bins(
+            self.is_periodic,
+            self.fft_size,
+            list(range(self.data.shape[1])),
+            self.data[i].tolist(),
+            self.sampling_freq,
+        )
+
+    def istft(self):
+        """
+        Inverse STFT by weighted overlap-add. Samples where every window is zero can't be recovered.
+        """
+
+        length = max(0, (len(self) - 1) * self.hop + self.frame_length)
+        out = np.zeros(length)
+        weight = np.zeros(length)
+        win_sq = self.window**2
+
+        for b in range(0, len(self), FRAMES_PER_BLOCK):
+            frames = np.fft.irfft(self.data[b : b + FRAMES_PER_BLOCK], n=self.fft_size)
+            frames = frames[:, : self.frame_length] * self.window
+
+            for i, frame in enumerate(frames):
+                start = (b + i) * self.hop
+                out[start : start + self.frame_length] += frame
+                weight[start : start + self.frame_length] += win_sq
+
+        nonzero = weight > 1e-10
+        out[nonzero] /= weight[nonzero]
+        out = out[: self.sample_count]
+
+        return TimeSignal(
+            self.is_periodic,
+            len(out),
+            [list(range(self.start_time, self.start_time + len(out))), out.tolist()],
+        )
@@ -0,0 +1,125 @@
+"""
+SpectrumBatch module
+
+Contains the DFT of many same length time signals, computed at once.
+The batch is transformed as one 2-D array with the FFT (split in row blocks across the worker
+threads), and amplitudes / phases are computed for the whole batch with vectorized calls.
+`FrequencySignal` objects are only created when a caller indexes into the batch.
+"""
+
+import math
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from dsp.models.FrequencySignal import FrequencySignal
+from dsp.models.TimeSignal import TimeSignal
+from dsp.utils.parallel import get_executor, get_workers
+
+# Rows per thread below which splitting the batch isn't worth the hand-off
+MIN_ROWS_PER_WORKER = 64
+
+
+class SpectrumBatch:
+    def __init__(
+        self,
+        harmonics: np.ndarray,
+        is_periodic: bool = False,
+        sample_freq: float | None = None,
+    ) -> None:
+        """
+        @param harmonics: complex array, one spectrum per row
+        """
+
+        self.harmonics = harmonics
+        self.is_periodic = is_periodic
+        self.sample_count = harmonics.shape[1]
+        self.sample_freq = sample_freq or self.sample_count
+        self.__freq: List[float] | None = None
+        self.__amp: np.ndarray | None = None
+        self.__pshift: np.ndarray | None = None
+        self.__signals: Dict[int, FrequencySignal] = {}
+
+    @staticmethod
+    def transform(
+        signals: "Sequence[TimeSignal] | np.ndarray",
+        sampling_freq: float | None = None,
+        workers: int | None = None,
+    ):
+        """
+        Compute the DFT of every signal
+
+        @param signals: list of same length TimeSignals, or a 2-D array with one signal per row
+        @param sampling_freq: same meaning as in `switch_domain`
+        @param workers: number of threads the batch is split across
+        """
+
+        is_periodic = False
+        if isinstance(signals, np.ndarray):
+            batch = np.atleast_2d(np.asarray(signals, dtype=float))
+        else:
+            if not signals:
+                raise ValueError("At least one signal must be provided")
+            if len({len(s) for s in signals}) != 1:
+                raise ValueError("All signals must have the same sample count")
+            batch = np.array([s["amp"][: len(s)] for s in signals], dtype=float)
+            is_periodic = all(s.is_periodic for s in signals)
+
+        workers = min(get_workers(workers), max(1, len(batch) // MIN_ROWS_PER_WORKER))
+
+        if workers == 1:
+            harmonics = np.fft.fft(batch, axis=1)
+        else:
+            harmonics = np.empty(batch.shape, dtype=complex)
+
+            def block(a: int, b: int):
+                harmonics[a:b] = np.fft.fft(batch[a:b], axis=1)
+
+            bounds = np.linspace(0, len(batch), workers + 1).astype(int)
+            list(get_executor(workers).map(block, bounds[:-1], bounds[1:]))
+
+        return SpectrumBatch(harmonics, is_periodic, sampling_freq)
+
+    def __len__(self):
+        return len(self.harmonics)
+
+    @property
+    def freq(self) -> List[float]:
+        if self.__freq is None:
+            omega = (2 * math.pi) / (self.sample_count * (1 / self.sample_freq))
+            self.__freq = [omega * i for i in range(1, self.sample_count + 1)]
+        return self.__freq
+
+    @property
+    def amp(self) -> np.ndarray:
+        if self.__amp is None:
+            self.__amp = np.abs(self.harmonics)
+        return self.__amp
+
+    @property
+    def pshift(self) -> np.ndarray:
+        if self.__pshift is None:
+            self.__pshift = np.angle(self.harmonics)
+        return self.__pshift
+
+    def __getitem__(self, i: int) -> FrequencySignal:
+        """
+        The i-th spectrum as a FrequencySignal, built on first access
+        """
+
+        if i < 0:
+            i += len(self)
+
+        if i not in self.__signals:
+            signal = FrequencySignal(
+                self.is_periodic,
+                self.sample_count,
+                [self.freq, self.amp[i].tolist(), self.pshift[i].tolist()],
+            )
+            signal.harmonics = self.harmonics[i].tolist()
+            self.__signals[i] = signal
+
+        return self.__signals[i]
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
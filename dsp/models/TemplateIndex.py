@@ -0,0 +1,124 @@
+"""
+TemplateIndex module
+
+Matched-filter search of a signal against a library of waveform templates.
+The conjugate spectra of the templates are computed once per FFT size and kept, so a search costs
+one FFT of the input plus one inverse FFT per template.
+
+A template t matches the signal x at lag l with the normalized score
+    sum_n t(n) * x(n + l) / sqrt(Et * Ex(l))
+where Ex(l) is the energy of the samples of x under the template, taken from running sums.
+Only lags where the template lies entirely inside the signal are searched.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from dsp.models.TimeSignal import TimeSignal
+from dsp.utils.convolution import fft_length
+
+# Templates correlated per inverse FFT call, bounds the scratch memory of a search
+TEMPLATES_PER_BLOCK = 64
+
+
+class TemplateIndex:
+    def __init__(self, templates: "Sequence[TimeSignal | np.ndarray]" = ()) -> None:
+        """
+        @param templates: TimeSignals or amplitude arrays (starting at 0)
+        """
+
+        self.templates: List[np.ndarray] = []
+        self.starts: List[int] = []
+        self.energies: List[float] = []
+        self.__spectra: Dict[int, np.ndarray] = {}
+
+        for template in templates:
+            self.add(template)
+
+    def __len__(self):
+        return len(self.templates)
+
+    def add(self, template: "TimeSignal | np.ndarray") -> int:
+        """
+        Add a template to the library
+
+        @return: index of the template, as reported by `search`
+        """
+
+        if isinstance(template, TimeSignal):
+            x = np.asarray(template["amp"][: template.sample_count], dtype=float)
+            start = int(template["time"][0]) if len(x) else 0
+        else:
+            x = np.asarray(template, dtype=float)
+            start = 0
+
+        energy = float(np.dot(x, x))
+        if energy == 0:
+            raise ValueError("Cannot match a zero energy template")
+
+        self.templates.append(x)
+        self.starts.append(start)
+        self.energies.append(energy)
+        self.__spectra.clear()
+
+        return len(self.templates) - 1
+
+    def spectra(self, n: int) -> np.ndarray:
+        """
+        Conjugate n point spectra of every template, one per row, computed on first use
+        """
+
+        if n not in self.__spectra:
+            rows = np.zeros((len(self), n // 2 + 1), dtype=complex)
+            for i, x in enumerate(self.templates):
+                rows[i] = np.conj(np.fft.rfft(x, n))
+            self.__spectra[n] = rows
+
+        return self.__spectra[n]
+
+    def search(self, signal: "TimeSignal | np.ndarray", top_k: int = 5) -> List[Tuple[int, int, float]]:
+        """
+        Find the templates that best match the signal
+
+        @param top_k: number of hits to return
+        @return: (template index, lag, score) of the best lag of each template, best scores first.
+        As in `TimeSignal.correlate`, the lag is the time shift of the signal relative to the template.
+        """
+
+        if not self.templates:
+            raise ValueError("The template library is empty")
+
+        if isinstance(signal, TimeSignal):
+            x = np.asarray(signal["amp"][: signal.sample_count], dtype=float)
+            start = int(signal["time"][0]) if len(x) else 0
+        else:
+            x = np.asarray(signal, dtype=float)
+            start = 0
+
+        n = fft_length(len(x) + max(len(t) for t in self.templates) - 1)
+        spectrum = np.fft.rfft(x, n)
+        spectra = self.spectra(n)
+        running = np.concatenate([[0.0], np.cumsum(x * x)])
+
+        hits: List[Tuple[int, int, float]] = []
+        for b in range(0, len(self), TEMPLATES_PER_BLOCK):
+            r = np.fft.irfft(spectra[b : b + TEMPLATES_PER_BLOCK] * spectrum, n)
+
+            for i, row in enumerate(r, b):
+                m = len(self.templates[i])
+                if m > len(x):
+                    continue
+
+                # energy of x under the template at every lag 0 .. len(x) - m
+                window = running[m:] - running[: len(x) - m + 1]
+                norm = np.sqrt(self.energies[i] * window)
+                scores = np.divide(
+                    row[: len(x) - m + 1], norm, out=np.zeros(len(window)), where=norm > 0
+                )
+
+                lag = int(np.argmax(scores))
+                hits.append((i, lag + start - self.starts[i], float(scores[lag])))
+
+        hits.sort(key=lambda hit: hit[2], reverse=True)
+        return hits[:top_k]
@@ -6,13 +6,23 @@ from dsp.enums.graph_function import GRAPH_FUNCTION
 from dsp.enums.graph_type import GRAPH_TYPE
 from dsp.models.FrequencySignal import FrequencySignal
 from dsp.utils import compare_floats
+from dsp.utils.convolution import direct_convolve
+from dsp.utils.correlation import (
+    correlate_circular,
+    correlate_linear,
+    correlate_range,
+    overlap_energies,
+)
+from dsp.utils.fourier import czt, goertzel
 from dsp.models.Filter import FirFilter
+from dsp.models.Window import Window
 from dsp.models.DigitalSignal import DigitalSignal
 from dsp.enums.signal_domain import SIGNAL_DOMAIN
 from matplotlib import pyplot as plt
 from matplotlib.figure import Figure
 
 import cmath
+import numpy as np
 
 
 class TimeSignal(DigitalSignal):
@@ -332,6 +342,120 @@ class TimeSignal(DigitalSignal):
 
         return FrequencySignal(self.is_periodic, N, [frequencies, dct_coefficients])
 
+    def goertzel(
+        self,
+        bins: List[float] | None = None,
+        frequencies: List[float] | None = None,
+        sampling_freq: float | None = None,
+    ):
+        """
+        Evaluate the DFT at selected bins only, using the Goertzel recurrence (O(N) per bin, see `fourier.goertzel`)
+
+        @param bins: DFT bin indices k (fractional bins are allowed)
+        @param frequencies: frequencies in Hz, converted to bins with k = f * N / sampling_freq
+        @param sampling_freq: same meaning as in `switch_domain`
+        @default: sample count, i.e. frequencies are given in cycles per signal length
+
+        @return: sparse FrequencySignal with one entry per requested bin; its `bins` attribute
+        holds the bin indices and its freq axis the evaluated frequencies, k * sampling_freq / N
+        """
+
+        N = self.sample_count
+        sampling_freq = sampling_freq or N
+
+        if (bins is None) == (frequencies is None):
+            raise ValueError("Exactly one of bins or frequencies must be provided")
+        if frequencies is not None:
+            bins = [f * N / sampling_freq for f in frequencies]
+        assert bins is not None
+
+        harmonics = goertzel(self.signal_data[1][:N], bins).tolist()
+
+        return FrequencySignal.from_bins(self.is_periodic, N, bins, harmonics, sampling_freq)
+
+    def zoom_fft(
+        self,
+        f_start: float,
+        f_stop: float,
+        points: int,
+        sampling_freq: float | None = None,
+    ):
+        """
+        Evaluate the spectrum at `points` evenly spaced frequencies from f_start to f_stop (inclusive)
+        with the chirp-z transform, in O((N + points) log(N + points)) instead of zero padding.
+
+        @param f_start, f_stop: band edges in Hz
+        @param sampling_freq: same meaning as in `switch_domain`
+        @default: sample count, i.e. frequencies are given in cycles per signal length
+
+        @return: FrequencySignal covering only the band; its `bins` attribute holds the
+        (fractional) DFT bin of every point and its freq axis the evaluated frequencies in Hz,
+        f_start .. f_stop
+        """
+
+        N = self.sample_count
+        sampling_freq = sampling_freq or N
+        if points < 1:
+            raise ValueError("At least one point must be evaluated")
+
+        step = (f_stop - f_start) / (points - 1) if points > 1 else 0.0
+        A = cmath.exp(2j * math.pi * f_start / sampling_freq)
+        W = cmath.exp(-2j * math.pi * step / sampling_freq)
+
+        harmonics = czt(self.signal_data[1][:N], points, W, A)
+        bins = [(f_start + step * k) * N / sampling_freq for k in range(points)]
+
+        return FrequencySignal.from_bins(
+            self.is_periodic, N, bins, harmonics.tolist(), sampling_freq
+        )
+
+    def stft(
+        self,
+        frame_length: int,
+        hop: int | None = None,
+        window: "Window | str" = "Hanning",
+        fft_size: int | None = None,
+        sampling_freq: float | None = None,
+        out_path: str | None = None,
+    ):
+        """
+        Short-time Fourier transform, see `Spectrogram.from_stream` for the parameters.
+        Use `istft` on the result to get the signal back. Unlike `switch_domain`, its frequencies
+        (`Spectrogram.freq`) are in Hz.
+        """
+
+        from dsp.models.SignalStream import SignalStream
+        from dsp.models.Spectrogram import Spectrogram
+
+        return Spectrogram.from_stream(
+            SignalStream.from_signal(self), frame_length, hop, window, fft_size, sampling_freq, out_path
+        )
+
+    def welch(
+        self,
+        segment_length: int,
+        overlap: int | None = None,
+        window: "Window | str" = "Hanning",
+        fft_size: int | None = None,
+        sampling_freq: float = 1.0,
+    ):
+        """
+        Welch power spectral density estimate, see `WelchEstimator` for the parameters.
+        Returns a FrequencySignal of power vs frequency in Hz (not the rad/s of `switch_domain`).
+        """
+
+        from dsp.models.SignalStream import SignalStream
+        from dsp.models.WelchEstimator import WelchEstimator
+
+        return WelchEstimator.from_stream(
+            SignalStream.from_signal(self),
+            segment_length,
+            overlap=overlap,
+            window=window,
+            fft_size=fft_size,
+            sampling_freq=sampling_freq,
+        ).result(self.is_periodic)
+
     def shifted(self, shift_amount: int):
         new_signal_data = [list(x) for x in self.signal_data]
 
@@ -370,7 +494,14 @@ class TimeSignal(DigitalSignal):
 
         return TimeSignal(self.is_periodic, new_signal_length, new_signal_data)
 
-    def convolve(self, signal: "TimeSignal"):
+    def convolve(self, signal: "TimeSignal", workers: int | None = None):
+        """
+        Linear convolution with another signal
+
+        @param workers: number of threads the output range is split across
+        @default: dsp.utils.parallel.workers (one per CPU core); small convolutions always run on one thread
+        """
+
         new_signal_length = len(self) + len(signal) - 1
 
         start_time = int(min(self["time"][0], signal["time"][0]))
@@ -378,18 +509,13 @@ class TimeSignal(DigitalSignal):
 
         new_signal_data = [
             [i for i in range(start_time, end_time)],
-            [0.0] * new_signal_length,
+            direct_convolve(
+                self.signal_data[1][: len(self)],
+                signal.signal_data[1][: len(signal)],
+                workers,
+            ).tolist(),
         ]
 
-        for n in range(new_signal_length):
-            for k in range(len(self)):
-                if n - k < 0 or n - k >= len(signal):
-                    continue
-
-                new_signal_data[1][n] += self.signal_data[1][k] * signal.signal_data[1][
-                    n - k
-                ]
-
         return TimeSignal(self.is_periodic, new_signal_length, new_signal_data)
 
     def extend(self, extendBy: int):
@@ -404,31 +530,66 @@ class TimeSignal(DigitalSignal):
             new_signal_data
         )
 
-    def correlate(self, signal: "TimeSignal"):
-        N = len(self) + len(signal) - 1
-
-        extended_self = self.extend(N - len(self))
-        extended_signal = signal.extend(N - len(signal))
-
-        print("EXTENDED SELF", extended_self.signal_data)
-
-        freq_self = extended_self.switch_domain()
-        assert isinstance(freq_self, FrequencySignal)
-        assert freq_self.harmonics is not None
+    def correlate(
+        self,
+        signal: "TimeSignal",
+        mode: Literal["linear", "circular"] | None = None,
+        max_lag: int | None = None,
+        normalization: Literal["global", "local"] = "global",
+    ):
+        """
+        Normalized cross-correlation r12(l) = sum_n x1(n) * x2(n + l) / sqrt(E1 * E2),
+        computed on the FFT path
+
+        @param mode: "circular" for lags 0 .. N - 1 (the shorter signal is zero padded to N);
+        "linear" for every lag of the zero padded signals, with the time axis holding the lag
+        @default: "circular" if both signals are periodic, "linear" otherwise
+        @param max_lag: only compute the lags -max_lag .. max_lag (time lags in linear mode),
+        directly in O(N * L) when the window is small enough to beat the FFT
+        @param normalization: "global" divides by the energies of the whole signals;
+        "local" (linear mode) by the energies of the samples overlapping at each lag
+        """
 
-        x1 = freq_self.conjugate()
-        x2 = extended_signal.switch_domain()
-        assert isinstance(x2, FrequencySignal)
+        if mode is None:
+            mode = "circular" if self.is_periodic and signal.is_periodic else "linear"
+        if mode not in ("linear", "circular"):
+            raise ValueError(f"Unknown correlation mode '{mode}'")
+        if normalization not in ("global", "local"):
+            raise ValueError(f"Unknown normalization '{normalization}'")
+        if max_lag is not None and max_lag < 0:
+            raise ValueError("Maximum lag must not be negative")
 
-        main_sig = x1 * x2
-        main_sig = main_sig.switch_domain()
-        assert isinstance(main_sig, TimeSignal)
+        x1 = np.asarray(self.signal_data[1][: self.sample_count], dtype=float)
+        x2 = np.asarray(signal.signal_data[1][: signal.sample_count], dtype=float)
 
         # Energies of signals
-        Ex1 = sum(self.square()["amp"])
-        Ex2 = sum(signal.square()["amp"])
+        Ex1 = float(np.dot(x1, x1))
+        Ex2 = float(np.dot(x2, x2))
+        if Ex1 == 0 or Ex2 == 0:
+            raise ValueError("Cannot normalize the correlation of a zero energy signal")
+
+        # a lag of d samples between the arrays is d + offset in time
+        offset = int(signal["time"][0] - self["time"][0]) if mode == "linear" else 0
+
+        if max_lag is not None:
+            first, last = -max_lag - offset, max_lag - offset
+            r = correlate_range(x1, x2, first, last, mode == "circular")
+        elif mode == "circular":
+            first, last = 0, max(len(x1), len(x2)) - 1
+            r = correlate_circular(x1, x2)
+        else:
+            first, last = -(len(x1) - 1), len(x2) - 1
+            r = correlate_linear(x1, x2)
+
+        if normalization == "local" and mode == "linear":
+            E1, E2 = overlap_energies(x1, x2, first, last)
+            norm = np.sqrt(E1 * E2)
+            r = np.divide(r, norm, out=np.zeros_like(r), where=norm > 0)
+        else:
+            r /= math.sqrt(Ex1 * Ex2)
 
-        return main_sig * (1 / (N ** 2)) * (1 / math.sqrt(Ex1 * Ex2))
+        lags = list(range(first + offset, last + offset + 1))
+        return TimeSignal(mode == "circular", len(r), [lags, r.tolist()])
 
     def remove_dc(self):
         mean = sum(self.signal_data[1]) / len(self)
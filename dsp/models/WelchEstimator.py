@@ -0,0 +1,109 @@
+"""
+WelchEstimator module
+
+Estimates the power spectral density (PSD) of a signal with Welch's method:
+the signal is split into overlapping windowed segments, and the periodograms of the segments
+are averaged. Periodograms are accumulated as samples arrive, so arbitrarily long streams are
+processed in constant memory.
+"""
+
+import numpy as np
+
+from dsp.models.Filter import FirFilter
+from dsp.models.FrequencySignal import FrequencySignal
+from dsp.models.SignalStream import SignalStream
+from dsp.models.Window import Window
+from dsp.utils.framing import FRAMES_PER_BLOCK, FrameBuffer
+
+
+class WelchEstimator:
+    def __init__(
+        self,
+        segment_length: int,
+        overlap: int | None = None,
+        window: Window | str = "Hanning",
+        fft_size: int | None = None,
+        sampling_freq: float = 1.0,
+    ) -> None:
+        """
+        @param overlap: samples shared by two consecutive segments
+        @default: segment_length // 2
+        @param window: a Window or the name of one of `FirFilter.windows`
+        @param fft_size: FFT length, segments are zero padded to it
+        @default: segment_length
+        @param sampling_freq: in Hz, sets the frequency axis and the density scale
+        @default: 1.0, i.e. frequencies in cycles per sample
+        """
+
+        overlap = segment_length // 2 if overlap is None else overlap
+        if not 0 <= overlap < segment_length:
+            raise ValueError("Overlap must be smaller than the segment length")
+
+        self.fft_size = fft_size or segment_length
+        if self.fft_size < segment_length:
+            raise ValueError("FFT size must be at least the segment length")
+        if isinstance(window, str):
+            window = FirFilter.find_window(window)
+
+        self.segment_length = segment_length
+        self.sampling_freq = sampling_freq
+        self.window = np.asarray(window.samples(segment_length), dtype=float)
+        self.frames = FrameBuffer(segment_length, segment_length - overlap)
+
+        self.segment_count = 0
+        self.__power = np.zeros(self.fft_size // 2 + 1)
+
+    @staticmethod
+    def from_stream(stream: SignalStream, segment_length: int, **kwargs):
+        estimator = WelchEstimator(segment_length, **kwargs)
+        for chunk in stream:
+            estimator.update(chunk)
+
+        return estimator
+
+    def update(self, samples):
+        """
+        Accumulate the periodograms of every segment completed by the new samples.
+        Incomplete trailing segments are never used.
+        """
+
+        frames = self.frames.push(samples)
+
+        for i in range(0, len(frames), FRAMES_PER_BLOCK):
+            block = frames[i : i + FRAMES_PER_BLOCK]
+            spectra = np.fft.rfft(block * self.window, n=self.fft_size)
+            self.__power += (spectra.real**2 + spectra.imag**2).sum(axis=0)
+            self.segment_count += len(block)
+
+    @property
+    def freq(self) -> np.ndarray:
+        return np.arange(len(self.__power)) * self.sampling_freq / self.fft_size
+
+    @property
+    def psd(self) -> np.ndarray:
+        """
+        One-sided power spectral density (power per Hz) averaged over the segments so far
+        """
+
+        if self.segment_count == 0:
+            raise ValueError("Not enough samples for a single segment")
+
+        psd = self.__power / (self.segment_count * self.sampling_freq * np.sum(self.window**2))
+
+        # fold the negative frequencies onto the positive ones (DC and Nyquist have no mirror)
+        last = len(psd) if self.fft_size % 2 else len(psd) - 1
+        psd[1:last] *= 2
+
+        return psd
+
+    def result(self, is_periodic: bool = False):
+        """
+        The current estimate as a FrequencySignal of power (amp axis) vs frequency in Hz
+        """
+
+        psd = self.psd
+        return FrequencySignal(
+            is_periodic,
+            len(psd),
+            [self.freq.tolist(), psd.tolist(), [0.0] * len(psd)],
+        )
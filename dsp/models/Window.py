@@ -3,19 +3,39 @@
 """
 
 import math
-from typing import Callable
+from typing import Callable, Dict
+
+import numpy as np
 
 
 class Window:
-    def __init__(self, fn: Callable[[int, int], float], stopbandAttenuation: float, transitionWidthFactor: float, name: str | None = None) -> None:
+    def __init__(self, fn: Callable[[np.ndarray, int], np.ndarray], stopbandAttenuation: float, transitionWidthFactor: float, name: str | None = None) -> None:
+        """
+        @param fn: window value at offsets n from the center, evaluated on a whole array of n at once
+        """
+
         self.fn = fn
         self.stopband_attenuation = stopbandAttenuation
         self.transitionWidthFactor = transitionWidthFactor
         self.name = name
+        self.__tables: Dict[int, np.ndarray] = {}
+
+    def samples(self, N: int) -> np.ndarray:
+        """
+        The N point window, centered on the middle sample (same n as used for filter design).
+        Tables are computed once per N and shared, so the returned array is read-only.
+        """
+
+        if N not in self.__tables:
+            table = np.asarray(self.fn(np.arange(N) - (N - 1) / 2, N), dtype=float)
+            table = np.broadcast_to(table, (N,)).copy()
+            table.setflags(write=False)
+            self.__tables[N] = table
+
+        return self.__tables[N]
 
     def getCoefficientCount(self, transitionBand: float):
         val = math.ceil(self.transitionWidthFactor / transitionBand)
         res = int(val) if val == int(val) else int(val) + 1
         res = res + 1 if res % 2 == 0 else res
-        print(f"Coefficient count ({self.transitionWidthFactor}/{transitionBand}): ", res)
         return res
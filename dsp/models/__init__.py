@@ -2,4 +2,19 @@ from dsp.models.DigitalSignal import DigitalSignal
 from dsp.models.TimeSignal import TimeSignal
 from dsp.models.FrequencySignal import FrequencySignal
 from dsp.models.Window import Window
+from dsp.models.KaiserWindow import KaiserWindow
 from dsp.models.Filter import FirFilter
+from dsp.models.IirFilter import IirFilter
+from dsp.models.SignalStream import SignalStream
+from dsp.models.Pipeline import Pipeline
+from dsp.models.SharedSignal import SharedSignal
+from dsp.models.ChunkedSignal import ChunkedSignal
+from dsp.models.SpectrumBatch import SpectrumBatch
+from dsp.models.SlidingDFT import SlidingDFT
+from dsp.models.Spectrogram import Spectrogram
+from dsp.models.WelchEstimator import WelchEstimator
+from dsp.models.DelayEstimator import DelayEstimator
+from dsp.models.TemplateIndex import TemplateIndex
+from dsp.models.FilterBank import FilterBank
+from dsp.models.FilterCascade import FilterCascade
+from dsp.models.DesignSweep import DesignSweep
@@ -0,0 +1,2 @@
+from dsp.service.server import ProcessingService, start_service
+from dsp.service.client import ServiceClient
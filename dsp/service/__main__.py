@@ -0,0 +1,8 @@
+import sys
+
+from dsp.service import start_service
+from dsp.service.server import DEFAULT_SOCKET_PATH
+
+if __name__ == '__main__':
+    # python -m dsp.service [socket path]
+    start_service(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_SOCKET_PATH)
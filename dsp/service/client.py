@@ -0,0 +1,38 @@
+"""
+Minimal blocking client for the processing service
+"""
+
+import json
+import socket
+from typing import Any, Dict, List
+
+from dsp.service.server import DEFAULT_SOCKET_PATH
+
+
+class ServiceClient:
+    def __init__(self, path: str | None = DEFAULT_SOCKET_PATH, host: str = "127.0.0.1", port: int = 0) -> None:
+        if path:
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.connect(path)
+        else:
+            self.socket = socket.create_connection((host, port))
+
+        self.file = self.socket.makefile("rwb")
+        self.__next_id = 0
+
+    def call(self, op: str, amp: List[float], start: int = 0, **params: Any) -> Dict[str, Any]:
+        self.__next_id += 1
+        request = {"id": self.__next_id, "op": op, "amp": list(amp), "start": start, "params": params}
+
+        self.file.write(json.dumps(request).encode() + b"\n")
+        self.file.flush()
+
+        response = json.loads(self.file.readline())
+        if "error" in response:
+            raise ValueError(response["error"])
+
+        return response
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
@@ -0,0 +1,288 @@
+"""
+Processing service
+
+A long-lived asyncio server that exposes the signal and filter operations to other local tools,
+so they don't pay the interpreter / matplotlib start-up cost for every computation.
+
+Protocol: newline delimited JSON over a Unix socket (or localhost TCP).
+Request:  {"id": 1, "op": "filter", "amp": [...], "start": 0, "params": {...}}
+Response: {"id": 1, "amp": [...], "start": -26}  or  {"id": 1, "error": "..."}
+
+Concurrent requests for the same operation, parameters and signal length are batched into one
+2-D array and processed with a single vectorized call on the worker pool.
+Filter designs and their spectra are cached, so repeated requests skip the design step entirely.
+"""
+
+import asyncio
+import contextlib
+import json
+import math
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from dsp.models.Filter import FirFilter
+from dsp.models.Pipeline import build_filter
+from dsp.utils.convolution import fft_convolve, fft_length
+
+DEFAULT_SOCKET_PATH = "/tmp/dsprocessor.sock"
+
+# Every operation takes a 2-D batch (one signal per row), the start time of each row and its
+# parameters, and returns the processed batch with the new start times.
+Operation = Callable[..., Tuple[np.ndarray, List[int]]]
+
+
+class ProcessingService:
+    def __init__(
+        self,
+        executor: ThreadPoolExecutor | None = None,
+        batch_delay: float = 0.002,
+        max_batch_size: int = 256,
+    ) -> None:
+        """
+        @param executor: thread pool running the CPU work; the numpy kernels release the GIL.
+        It must be a thread pool: the batches run as closures over the service and its filter
+        caches, which can't be sent to another process
+        @default: a new ThreadPoolExecutor
+        @param batch_delay: seconds to wait for more same-shaped requests before processing a batch
+        @param max_batch_size: process a batch immediately once it holds this many signals
+        """
+
+        self.executor = executor or ThreadPoolExecutor()
+        self.batch_delay = batch_delay
+        self.max_batch_size = max_batch_size
+
+        self.batches_run = 0
+        self.__pending: Dict[Tuple[str, str, int], "_Batch"] = {}
+        self.__filters: Dict[str, FirFilter] = {}
+        self.__spectra: Dict[Tuple[str, int], np.ndarray] = {}
+        self.__server: asyncio.AbstractServer | None = None
+        self.__socket_path: str | None = None
+        # running batches; the event loop only keeps weak references to tasks
+        self.__batches: "set[asyncio.Future]" = set()
+
+        self.operations: Dict[str, Operation] = {
+            "remove_dc": self.remove_dc,
+            "normalize": self.normalize,
+            "smooth": self.smooth,
+            "convolve": self.convolve,
+            "filter": self.filter,
+            "dft": self.dft,
+        }
+
+    # region: Operations
+    @staticmethod
+    def remove_dc(batch: np.ndarray, starts: List[int]):
+        return batch - batch.mean(axis=1, keepdims=True), starts
+
+    @staticmethod
+    def normalize(batch: np.ndarray, starts: List[int]):
+        return batch / np.abs(batch).max(axis=1, keepdims=True), starts
+
+    @staticmethod
+    def smooth(batch: np.ndarray, starts: List[int], window_size: int):
+        csum = np.concatenate([np.zeros((len(batch), 1)), np.cumsum(batch, axis=1)], axis=1)
+        return (csum[:, window_size:] - csum[:, :-window_size]) / window_size, starts
+
+    @staticmethod
+    def convolve(batch: np.ndarray, starts: List[int], coefficients: List[float], start: int = 0):
+        return fft_convolve(batch, coefficients), [min(s, start) for s in starts]
+
+    def filter(self, batch: np.ndarray, starts: List[int], **spec: Any):
+        fil, key = self.get_filter(spec)
+        n = fft_length(batch.shape[1] + fil.coefficient_count - 1)
+
+        if (key, n) not in self.__spectra:
+            self.__spectra[(key, n)] = np.fft.rfft(fil.coefficients, n)
+
+        m = (fil.coefficient_count - 1) // 2
+        out = fft_convolve(batch, fil.coefficients, self.__spectra[(key, n)])
+        return out, [min(s, -m) for s in starts]
+
+    @staticmethod
+    def dft(batch: np.ndarray, starts: List[int], sampling_frequency: float | None = None):
+        """
+        Returns rows of [amp..., pshift...]; split by `handle_request`
+        """
+
+        spectra = np.fft.fft(batch, axis=1)
+        return np.concatenate([np.abs(spectra), np.angle(spectra)], axis=1), starts
+    # endregion
+
+    def get_filter(self, spec: Dict[str, Any]):
+        """
+        Return the (cached) FirFilter designed from a spec, along with its cache key
+        """
+
+        key = json.dumps(spec, sort_keys=True)
+        if key not in self.__filters:
+            self.__filters[key] = build_filter(spec)
+
+        return self.__filters[key], key
+
+    async def submit(self, op: str, amp: List[float], start: int = 0, params: Dict[str, Any] | None = None):
+        """
+        Queue one signal for processing and wait for its result.
+        Returns the processed amplitudes and their start time.
+        """
+
+        if op not in self.operations:
+            raise ValueError(f"Unknown operation '{op}'")
+
+        # validated here, so a malformed signal fails on its own instead of its whole batch
+        row = np.asarray(amp, dtype=float)
+        if row.ndim != 1:
+            raise ValueError("amp must be a flat list of numbers")
+        if not np.all(np.isfinite(row)):
+            raise ValueError("amp must only contain finite numbers")
+
+        params = params or {}
+        loop = asyncio.get_running_loop()
+        key = (op, json.dumps(params, sort_keys=True), len(row))
+
+        batch = self.__pending.get(key)
+        if batch is None:
+            batch = _Batch(op, params)
+            self.__pending[key] = batch
+            batch.timer = loop.call_later(self.batch_delay, self.__flush, key)
+
+        future = loop.create_future()
+        batch.rows.append(row)
+        batch.starts.append(start)
+        batch.futures.append(future)
+
+        if len(batch.rows) >= self.max_batch_size:
+            batch.timer.cancel()  # type: ignore
+            self.__flush(key)
+
+        return await future
+
+    def __flush(self, key: Tuple[str, str, int]):
+        batch = self.__pending.pop(key, None)
+        if batch is None:
+            return
+
+        task = asyncio.ensure_future(self.__run_batch(batch))
+        self.__batches.add(task)
+        task.add_done_callback(self.__batches.discard)
+
+    async def __run_batch(self, batch: "_Batch"):
+        loop = asyncio.get_running_loop()
+        operation = self.operations[batch.op]
+
+        def work():
+            return operation(np.stack(batch.rows), batch.starts, **batch.params)
+
+        try:
+            out, starts = await loop.run_in_executor(self.executor, work)
+        except Exception as e:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches_run += 1
+        for i, future in enumerate(batch.futures):
+            if not future.done():
+                future.set_result((out[i], starts[i]))
+
+    async def handle_request(self, request: Dict[str, Any]):
+        response: Dict[str, Any] = {"id": request.get("id")}
+
+        try:
+            op = request["op"]
+            amp, start = await self.submit(
+                op, request["amp"], int(request.get("start", 0)), request.get("params")
+            )
+        except Exception as e:
+            response["error"] = f"{type(e).__name__}: {e}"
+            return response
+
+        if op == "dft":
+            n = len(amp) // 2
+            sampling_frequency = (request.get("params") or {}).get("sampling_frequency") or n
+            omega = 2 * math.pi * sampling_frequency / n
+            response["freq"] = [omega * i for i in range(1, n + 1)]
+            response["amp"] = amp[:n].tolist()
+            response["pshift"] = amp[n:].tolist()
+        else:
+            response["amp"] = amp.tolist()
+            response["start"] = start
+
+        return response
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        lock = asyncio.Lock()
+        tasks = set()
+
+        async def respond(line: bytes):
+            try:
+                response = await self.handle_request(json.loads(line))
+            except json.JSONDecodeError as e:
+                response = {"id": None, "error": f"Invalid request: {e}"}
+
+            async with lock:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            # requests on one connection are answered as they complete, not in order
+            while line := await reader.readline():
+                task = asyncio.ensure_future(respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def start(self, path: str | None = DEFAULT_SOCKET_PATH, host: str = "127.0.0.1", port: int = 0):
+        """
+        Start listening on a Unix socket at `path`, or on localhost TCP if path is None.
+        A socket file left at `path` by a previous run is replaced.
+        """
+
+        if path:
+            with contextlib.suppress(FileNotFoundError):
+                if stat.S_ISSOCK(os.stat(path).st_mode):
+                    os.unlink(path)
+            self.__socket_path = path
+            self.__server = await asyncio.start_unix_server(self.handle_connection, path, limit=2**26)
+        else:
+            self.__server = await asyncio.start_server(self.handle_connection, host, port, limit=2**26)
+
+        return self.__server
+
+    async def serve_forever(self, **kwargs: Any):
+        server = await self.start(**kwargs)
+        async with server:
+            await server.serve_forever()
+
+    async def stop(self):
+        if self.__server:
+            self.__server.close()
+            await self.__server.wait_closed()
+            self.__server = None
+
+        if self.__socket_path:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.__socket_path)
+            self.__socket_path = None
+
+
+class _Batch:
+    def __init__(self, op: str, params: Dict[str, Any]) -> None:
+        self.op = op
+        self.params = params
+        self.rows: List[np.ndarray] = []
+        self.starts: List[int] = []
+        self.futures: List[asyncio.Future] = []
+        self.timer: asyncio.TimerHandle | None = None
+
+
+def start_service(path: str | None = DEFAULT_SOCKET_PATH, **kwargs: Any):
+    asyncio.run(ProcessingService().serve_forever(path=path, **kwargs))
@@ -0,0 +1,132 @@
+"""
+Biquad kernels
+
+Cascades of second-order sections (biquads), each row of `sos` holding
+[b0, b1, b2, a0, a1, a2] (a0 = 1) of
+
+    y(n) = b0 x(n) + b1 x(n - 1) + b2 x(n - 2) - a1 y(n - 1) - a2 y(n - 2)
+
+The recursion is evaluated a block of BLOCK_SIZE samples at a time: with zero initial state the
+first BLOCK_SIZE outputs are a convolution with the section's impulse response, which a single
+matrix product computes for every block at once. Each block's outputs then only need the
+contribution of the two outputs before it, which is carried from block to block in a scalar loop.
+"""
+
+from typing import List
+
+import numpy as np
+
+# Samples per block of the recursion, trades the per-block loop for the matrix product size
+BLOCK_SIZE = 64
+
+
+class _Section:
+    def __init__(self, b: np.ndarray, a: np.ndarray) -> None:
+        self.b = b
+        self.a1, self.a2 = float(a[1]), float(a[2])
+
+        # responses of y(n) = w(n) - a1 y(n - 1) - a2 y(n - 2) over one block:
+        # g to a unit impulse in w, c1 / c2 to y(-1) = 1 / y(-2) = 1 with w = 0
+        L = BLOCK_SIZE
+        responses = np.zeros((3, L + 2))
+        responses[0, 2] = 1.0
+        responses[1, 1] = 1.0
+        responses[2, 0] = 1.0
+        for i in range(L):
+            responses[:, i + 2] += -self.a1 * responses[:, i + 1] - self.a2 * responses[:, i]
+        self.g, self.c1, self.c2 = responses[0, 2:], responses[1, 2:], responses[2, 2:]
+
+        # zero state block response: row vector of w times this upper triangular Toeplitz matrix
+        index = np.arange(L)[None, :] - np.arange(L)[:, None]
+        self.toeplitz = np.where(index >= 0, self.g[np.clip(index, 0, None)], 0.0)
+
+        self.reset()
+
+    def reset(self):
+        self.x1 = self.x2 = 0.0  # x(n - 1), x(n - 2)
+        self.y1 = self.y2 = 0.0  # y(n - 1), y(n - 2)
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        n = len(x)
+        if n == 0:
+            return x
+
+        b0, b1, b2 = self.b
+        padded = np.concatenate([[self.x2, self.x1], x])
+        w = b0 * padded[2:] + b1 * padded[1:-1] + b2 * padded[:-2]
+
+        L = BLOCK_SIZE
+        blocks = -(-n // L)
+        w = np.concatenate([w, np.zeros(blocks * L - n)]).reshape(blocks, L)
+        zero_state = w @ self.toeplitz
+
+        # outputs before every block
+        last, before_last = zero_state[:, -1].tolist(), zero_state[:, -2].tolist()
+        c1_last, c1_before = float(self.c1[-1]), float(self.c1[-2])
+        c2_last, c2_before = float(self.c2[-1]), float(self.c2[-2])
+        starts = np.empty((blocks, 2))
+        y1, y2 = self.y1, self.y2
+        for k in range(blocks):
+            starts[k] = y1, y2
+            y1, y2 = (
+                last[k] + c1_last * y1 + c2_last * y2,
+                before_last[k] + c1_before * y1 + c2_before * y2,
+            )
+
+        y = zero_state + starts[:, :1] * self.c1 + starts[:, 1:] * self.c2
+        y = y.reshape(-1)[:n]
+
+        # the padding of the last block doesn't belong to the state
+        self.x1, self.x2 = (float(x[-1]), float(x[-2]) if n > 1 else self.x1)
+        self.y1, self.y2 = (float(y[-1]), float(y[-2]) if n > 1 else self.y1)
+
+        return y
+
+
+class BiquadCascade:
+    """
+    Stateful cascade of second-order sections.
+
+    Feeding the chunks of a signal through `process` gives the same samples as filtering the whole
+    signal at once. The output has one sample per input sample; `flush` returns nothing and clears
+    the state, so it has the same process / flush interface as a `StreamingConvolver`.
+    `SignalStream.apply` (and the pipeline's filter stage) run it for an `IirFilter`.
+    """
+
+    def __init__(self, sos) -> None:
+        self.sos = np.atleast_2d(np.asarray(sos, dtype=float))
+        if self.sos.shape[1] != 6:
+            raise ValueError("Second-order sections must have 6 coefficients")
+
+        self.sections: List[_Section] = []
+        for row in self.sos:
+            if row[3] == 0:
+                raise ValueError("a0 of a second-order section must not be 0")
+            row = row / row[3]
+            self.sections.append(_Section(row[:3], row[3:]))
+
+    def reset(self):
+        for section in self.sections:
+            section.reset()
+
+    def process(self, chunk) -> np.ndarray:
+        y = np.asarray(chunk, dtype=float)
+        for section in self.sections:
+            y = section.process(y)
+        return y
+
+    def flush(self) -> np.ndarray:
+        self.reset()
+        return np.zeros(0)
+
+
+def sos_response(sos, freq) -> np.ndarray:
+    """
+    Complex frequency response of a cascade at normalized frequencies (cycles per sample)
+    """
+
+    z = np.exp(-2j * np.pi * np.asarray(freq, dtype=float))
+    h = np.ones(z.shape, dtype=complex)
+    for b0, b1, b2, a0, a1, a2 in np.atleast_2d(sos):
+        h *= (b0 + b1 * z + b2 * z**2) / (a0 + a1 * z + a2 * z**2)
+    return h
@@ -0,0 +1,341 @@
+"""
+Convolution kernels
+
+Vectorized building blocks used by the signal and filter models.
+All kernels work on numpy arrays holding the amplitude axis only; the time axis
+is handled by the caller (delta time is always assumed to be 1).
+"""
+
+import numpy as np
+
+from dsp.utils.parallel import get_executor, get_workers
+
+# Below this many multiply-adds, the thread hand-off costs more than it saves
+PARALLEL_THRESHOLD = 1 << 18
+# Cost of an n point FFT convolution per n * log2(n), in multiply-adds of np.convolve
+FFT_COST_FACTOR = 24
+
+
+def direct_convolve(x, h, thread_count: int | None = None) -> np.ndarray:
+    """
+    Full linear convolution of x and h computed directly (no FFT), in O(len(x) * len(h)).
+
+    The output index range is split into one contiguous block per thread; each block only reads
+    the input samples it depends on and runs numpy's convolution kernel, which releases the GIL,
+    so the blocks run on separate cores.
+    """
+
+    x = np.asarray(x, dtype=float)
+    h = np.asarray(h, dtype=float)
+    if len(x) == 0 or len(h) == 0:
+        return np.zeros(0)
+
+    # convolution is commutative: slide the shorter sequence over the longer one
+    if len(h) > len(x):
+        x, h = h, x
+
+    out_len = len(x) + len(h) - 1
+    thread_count = min(get_workers(thread_count), max(1, len(x) * len(h) // PARALLEL_THRESHOLD))
+
+    if thread_count <= 1:
+        return np.convolve(x, h)
+
+    # y[n] = sum_k h[k] * x[n - k] is the 'valid' convolution of the zero padded input over
+    # padded[n : n + len(h)], so any output block [a, b) needs padded[a : b + len(h) - 1]
+    pad = np.zeros(len(h) - 1)
+    padded = np.concatenate([pad, x, pad])
+    out = np.empty(out_len)
+
+    def block(a: int, b: int):
+        out[a:b] = np.convolve(padded[a : b + len(h) - 1], h, "valid")
+
+    bounds = np.linspace(0, out_len, thread_count + 1).astype(int)
+    list(get_executor(thread_count).map(block, bounds[:-1], bounds[1:]))
+
+    return out
+
+
+class StreamingConvolver:
+    """
+    Stateful overlap-add convolution of an unbounded input with a fixed kernel.
+
+    Feeding the chunks of a signal through `process` and then calling `flush`
+    produces exactly the full linear convolution (len(x) + len(h) - 1 samples),
+    without ever holding more than one chunk plus the kernel tail in memory.
+    """
+
+    def __init__(self, coefficients) -> None:
+        self.coefficients = np.asarray(coefficients, dtype=float)
+        self.overlap = np.zeros(len(self.coefficients) - 1)
+
+    def process(self, chunk) -> np.ndarray:
+        chunk = np.asarray(chunk, dtype=float)
+        if len(chunk) == 0:
+            return chunk
+
+        out = self.convolve(chunk)
+        tail = len(self.overlap)
+        out[:tail] += self.overlap
+
+        # samples past the end of this chunk only become final once the next
+        # chunk (or the flush) has contributed to them
+        ready = len(chunk)
+        self.overlap = out[ready:].copy()
+
+        return out[:ready]
+
+    def flush(self) -> np.ndarray:
+        out = self.overlap
+        self.overlap = np.zeros(len(self.coefficients) - 1)
+        return out
+
+    def convolve(self, x) -> np.ndarray:
+        """
+        Full linear convolution of one whole input with the kernel
+        """
+
+        return np.convolve(np.asarray(x, dtype=float), self.coefficients)
+
+
+def fft_length(n: int) -> int:
+    """
+    Smallest power of two that is >= n
+    """
+
+    return 1 << max(n - 1, 0).bit_length()
+
+
+def convolution_cost(signal_length: int, kernel_length: int) -> float:
+    """
+    Estimated cost of a full linear convolution, in np.convolve multiply-adds:
+    direct, or the FFT path when that is cheaper
+    """
+
+    if signal_length == 0 or kernel_length == 0:
+        return 0.0
+
+    n = fft_length(signal_length + kernel_length - 1)
+    return min(signal_length * kernel_length, FFT_COST_FACTOR * n * np.log2(max(n, 2)))
+
+
+def auto_convolve(x, h) -> np.ndarray:
+    """
+    Full linear convolution, direct or on the FFT path, whichever `convolution_cost` finds cheaper
+    """
+
+    x = np.asarray(x, dtype=float)
+    h = np.asarray(h, dtype=float)
+    if len(x) == 0 or len(h) == 0:
+        return np.zeros(0)
+    if convolution_cost(len(x), len(h)) < len(x) * len(h):
+        return fft_convolve(x, h)
+    return np.convolve(x, h)
+
+
+def fft_convolve(x, h, spectrum=None) -> np.ndarray:
+    """
+    Full linear convolution of every row of x with the kernel h, computed with the FFT.
+
+    @param x: 1-D signal or 2-D batch of same length signals (one per row)
+    @param spectrum: precomputed `np.fft.rfft(h, fft_length(x.shape[-1] + len(h) - 1))`, to skip
+    transforming the kernel again
+    """
+
+    x = np.asarray(x, dtype=float)
+    h = np.asarray(h, dtype=float)
+    out_len = x.shape[-1] + len(h) - 1
+    n = fft_length(out_len)
+
+    if spectrum is None:
+        spectrum = np.fft.rfft(h, n)
+
+    return np.fft.irfft(np.fft.rfft(x, n) * spectrum, n)[..., :out_len]
+
+
+def symmetry(h, tolerance: float = 1e-12) -> int:
+    """
+    Linear phase type of an odd length kernel
+
+    @return: 1 if h[k] == h[K - 1 - k], -1 if h[k] == -h[K - 1 - k], 0 otherwise (or for even lengths)
+    """
+
+    h = np.asarray(h, dtype=float)
+    if len(h) % 2 == 0:
+        return 0
+
+    scale = tolerance * max(1.0, float(np.max(np.abs(h))))
+    if np.all(np.abs(h - h[::-1]) <= scale):
+        return 1
+    if np.all(np.abs(h + h[::-1]) <= scale):
+        return -1
+    return 0
+
+
+class LinearPhaseConvolver(StreamingConvolver):
+    """
+    Convolution with an odd length symmetric or antisymmetric kernel (a linear phase FIR filter).
+
+    Such a kernel is a zero phase kernel delayed by m = (K - 1) / 2 samples, and the spectrum of
+    the zero phase kernel is purely real (symmetric) or purely imaginary (antisymmetric).
+    On the FFT path the spectral product then takes 2 real multiplies per bin instead of a full
+    complex multiply, the cached response holds only that real (or imaginary) part, and the delay
+    is applied by indexing the output. Short kernels, where the FFT doesn't pay off, are convolved
+    directly with the full kernel.
+
+    The symmetry is used in the frequency domain rather than by pre-adding mirrored input samples
+    (x[n - k] + x[n - K + 1 + k]) to halve the multiplies: a pre-add over numpy arrays takes a pass
+    over the signal per tap and is several times slower than np.convolve's compiled loop.
+
+    Works on whole signals through `convolve`, and chunk by chunk through `process` / `flush`.
+    """
+
+    def __init__(self, coefficients, parity: int | None = None) -> None:
+        """
+        @param parity: 1 for a symmetric kernel, -1 for an antisymmetric one
+        @default: detected with `symmetry`
+        """
+
+        coefficients = np.asarray(coefficients, dtype=float)
+        parity = symmetry(coefficients) if parity is None else parity
+        if parity not in (1, -1) or len(coefficients) % 2 == 0:
+            raise ValueError("Kernel must have an odd length and be symmetric or antisymmetric")
+
+        super().__init__(coefficients)
+        self.parity = parity
+        self.delay = (len(coefficients) - 1) // 2
+        # h[m], h[m + 1] .. h[K - 1]; the other half is the mirror image
+        self.half = coefficients[self.delay :].copy()
+        self.__responses: dict = {}
+
+    def response(self, n: int) -> np.ndarray:
+        """
+        n point spectrum of the zero phase kernel, real part (symmetric) or imaginary part
+        (antisymmetric) only
+        """
+
+        if n not in self.__responses:
+            # centered kernel h[m + j] for j = -m .. m, negative j wrapped to the end
+            centered = np.zeros(n)
+            centered[: len(self.half)] = self.half
+            centered[n - self.delay :] = self.parity * self.half[:0:-1]
+            spectrum = np.fft.rfft(centered)
+            self.__responses[n] = spectrum.real.copy() if self.parity == 1 else spectrum.imag.copy()
+
+        return self.__responses[n]
+
+    def convolve(self, x) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        K = len(self.coefficients)
+        if len(x) == 0:
+            return np.zeros(0)
+
+        out_len = len(x) + K - 1
+        n = fft_length(out_len)
+        if convolution_cost(len(x), K) >= len(x) * K:
+            return np.convolve(x, self.coefficients)
+
+        spectrum = np.fft.rfft(x, n)
+        # (re, im) pairs of every bin, scaled in place by the real response
+        pairs = spectrum.view(np.float64).reshape(-1, 2)
+        pairs *= self.response(n)[:, None]
+        if self.parity == -1:
+            # multiplying by j: (re, im) -> (-im, re)
+            pairs[:] = pairs[:, ::-1]
+            pairs[:, 0] *= -1
+
+        y = np.fft.irfft(spectrum, n)
+
+        # undo the centering: the zero phase output is ahead of the causal one by m samples
+        m = self.delay
+        return np.concatenate([y[n - m :], y[: out_len - m]])
+
+
+class PartitionedConvolver(StreamingConvolver):
+    """
+    Uniformly partitioned overlap-save convolution, for low latency filtering with long kernels.
+
+    The kernel is cut into P = ceil(K / B) partitions of B taps, each transformed once with a 2B
+    point FFT. Every block of B input samples is transformed once and kept in a frequency domain
+    delay line; the output block is the sum over p of partition p times the spectrum of the block
+    from p blocks ago. An output block is ready as soon as its input block is complete, so the
+    latency is B samples whatever the kernel length, for about the per-sample cost of one 2B point
+    FFT convolution.
+
+    `process` returns the output samples completed so far (a multiple of B), `flush` the rest,
+    so the concatenated output is still the full linear convolution.
+    """
+
+    def __init__(self, coefficients, block_size: int = 256) -> None:
+        if block_size <= 0:
+            raise ValueError("Block size must be positive")
+
+        super().__init__(coefficients)
+        self.block_size = B = block_size
+        K = max(1, len(self.coefficients))
+        self.partition_count = P = -(-K // B)
+
+        kernel = np.zeros(P * B)
+        kernel[: len(self.coefficients)] = self.coefficients
+        self.partitions = np.fft.rfft(kernel.reshape(P, B), 2 * B, axis=1)
+
+        self.reset()
+
+    @property
+    def latency(self) -> int:
+        return self.block_size
+
+    def reset(self):
+        """
+        Forget every sample processed so far
+        """
+
+        B = self.block_size
+        self.delay_line = np.zeros((self.partition_count, B + 1), dtype=complex)
+        self.head = 0  # row of the newest block spectrum
+        self.previous = np.zeros(B)  # last complete input block
+        self.pending = np.zeros(0)  # samples of the incomplete input block
+        self.samples_in = 0
+        self.samples_out = 0
+
+    def process(self, chunk) -> np.ndarray:
+        chunk = np.asarray(chunk, dtype=float)
+        self.samples_in += len(chunk)
+        data = np.concatenate([self.pending, chunk])
+
+        B = self.block_size
+        blocks = len(data) // B
+        out = np.empty(blocks * B)
+        for i in range(blocks):
+            out[i * B : (i + 1) * B] = self.__block(data[i * B : (i + 1) * B])
+
+        self.pending = data[blocks * B :]
+        self.samples_out += len(out)
+        return out
+
+    def flush(self) -> np.ndarray:
+        B = self.block_size
+        total = self.samples_in + len(self.coefficients) - 1
+        missing = max(0, total - self.samples_out)
+
+        data = np.concatenate([self.pending, np.zeros(-(-missing // B) * B - len(self.pending))])
+        out = np.concatenate([self.__block(data[i : i + B]) for i in range(0, len(data), B)] or [np.zeros(0)])
+
+        self.reset()
+        return out[:missing]
+
+    def convolve(self, x) -> np.ndarray:
+        return fft_convolve(x, self.coefficients)
+
+    def __block(self, block: np.ndarray) -> np.ndarray:
+        B, P = self.block_size, self.partition_count
+
+        self.head = (self.head + 1) % P
+        self.delay_line[self.head] = np.fft.rfft(np.concatenate([self.previous, block]))
+        self.previous = block
+
+        # partition p meets the block spectrum from p blocks ago
+        order = (self.head - np.arange(P)) % P
+        spectrum = np.einsum("pk,pk->k", self.partitions, self.delay_line[order])
+
+        # overlap-save: the first half of the circular result is aliased
+        return np.fft.irfft(spectrum, 2 * B)[B:]
@@ -0,0 +1,123 @@
+"""
+Cross-correlation kernels
+
+Raw (unnormalized) cross-correlation r[l] = sum_n x1[n] * x2[n + l] of amplitude arrays,
+computed on the FFT path, or directly for a small window of lags.
+"""
+
+import numpy as np
+
+from dsp.utils.convolution import fft_length
+
+
+def correlate_linear(x1, x2) -> np.ndarray:
+    """
+    Linear cross-correlation for every lag from -(len(x1) - 1) to len(x2) - 1, in that order
+    """
+
+    x1 = np.asarray(x1, dtype=float)
+    x2 = np.asarray(x2, dtype=float)
+    if len(x1) == 0 or len(x2) == 0:
+        return np.zeros(0)
+
+    # zero padding to at least len(x1) + len(x2) - 1 keeps the negative lags from wrapping onto
+    # the positive ones; they end up at the end of the circular result instead
+    n = fft_length(len(x1) + len(x2) - 1)
+    r = np.fft.irfft(np.conj(np.fft.rfft(x1, n)) * np.fft.rfft(x2, n), n)
+
+    return np.concatenate([r[n - len(x1) + 1 :], r[: len(x2)]])
+
+
+def correlate_circular(x1, x2) -> np.ndarray:
+    """
+    Circular cross-correlation for lags 0 .. N - 1, the shorter signal is zero padded to N
+    """
+
+    x1 = np.asarray(x1, dtype=float)
+    x2 = np.asarray(x2, dtype=float)
+    N = max(len(x1), len(x2))
+
+    return np.fft.irfft(np.conj(np.fft.rfft(x1, N)) * np.fft.rfft(x2, N), N)
+
+
+# Cost of one direct lag (a dot product call) beyond its multiply-adds, in samples
+DIRECT_LAG_OVERHEAD = 2048
+# Cost of the FFT path per n * log2(n), in samples of a direct dot product
+FFT_COST_FACTOR = 8
+
+
+def correlate_direct(x1, x2, first: int, last: int, circular: bool = False) -> np.ndarray:
+    """
+    Correlation for the lags first .. last only, one dot product per lag: O(N * L) for L lags.
+    Linear lags without any overlap are 0; circular lags wrap around N = max(len(x1), len(x2)).
+    """
+
+    x1 = np.asarray(x1, dtype=float)
+    x2 = np.asarray(x2, dtype=float)
+    r = np.zeros(max(0, last - first + 1))
+
+    if circular:
+        N = max(len(x1), len(x2))
+        x1 = np.pad(x1, (0, N - len(x1)))
+        x2 = np.pad(x2, (0, N - len(x2)))
+        for i, lag in enumerate(range(first, last + 1)):
+            d = lag % N
+            r[i] = np.dot(x1[: N - d], x2[d:]) + np.dot(x1[N - d :], x2[:d])
+        return r
+
+    for i, lag in enumerate(range(first, last + 1)):
+        lo = max(0, -lag)
+        hi = min(len(x1), len(x2) - lag)
+        if hi > lo:
+            r[i] = np.dot(x1[lo:hi], x2[lo + lag : hi + lag])
+
+    return r
+
+
+def correlate_range(x1, x2, first: int, last: int, circular: bool = False) -> np.ndarray:
+    """
+    Correlation for the lags first .. last, computed directly when the lag window is small
+    and taken from the full FFT result otherwise
+    """
+
+    n1, n2 = len(x1), len(x2)
+    lag_count = max(0, last - first + 1)
+    n = max(n1, n2) if circular else fft_length(n1 + n2 - 1)
+    direct_cost = lag_count * (min(n1, n2) + DIRECT_LAG_OVERHEAD)
+
+    if n1 == 0 or n2 == 0 or direct_cost <= FFT_COST_FACTOR * n * max(1, np.log2(n)):
+        return correlate_direct(x1, x2, first, last, circular)
+
+    lags = np.arange(first, last + 1)
+    if circular:
+        return correlate_circular(x1, x2)[lags % n]
+
+    # lags past either end have no overlap
+    full = correlate_linear(x1, x2)
+    valid = (lags > -n1) & (lags < n2)
+    r = np.zeros(lag_count)
+    r[valid] = full[lags[valid] + n1 - 1]
+
+    return r
+
+
+def overlap_energies(x1, x2, first: int, last: int):
+    """
+    Energies of the samples of x1 and x2 that overlap at each linear lag first .. last,
+    taken from running sums of the squared samples in O(1) per lag
+    """
+
+    x1 = np.asarray(x1, dtype=float)
+    x2 = np.asarray(x2, dtype=float)
+    e1 = np.concatenate([[0.0], np.cumsum(x1 * x1)])
+    e2 = np.concatenate([[0.0], np.cumsum(x2 * x2)])
+
+    lags = np.arange(first, last + 1)
+    lo = np.clip(-lags, 0, len(x1))
+    hi = np.maximum(np.clip(len(x2) - lags, 0, len(x1)), lo)
+
+    # x1[lo:hi] meets x2[lo + lag : hi + lag], empty overlaps give equal indices
+    lo2 = np.clip(lo + lags, 0, len(x2))
+    hi2 = np.clip(hi + lags, 0, len(x2))
+
+    return e1[hi] - e1[lo], e2[hi2] - e2[lo2]
@@ -0,0 +1,77 @@
+"""
+Fourier transform kernels
+"""
+
+import numpy as np
+
+from dsp.utils.convolution import fft_length
+
+# Samples the Goertzel recurrence advances at once, with one matrix product per block
+GOERTZEL_BLOCK_SIZE = 1024
+
+
+def czt(x, M: int, W: complex, A: complex = 1) -> np.ndarray:
+    """
+    Chirp-z transform: X[k] = sum_n x[n] * A^(-n) * W^(n * k) for k = 0 .. M - 1
+
+    Computed with Bluestein's algorithm: writing n * k = (n² + k² - (k - n)²) / 2 turns the sum
+    into a convolution with a chirp, evaluated with FFTs of length >= N + M - 1, so the cost is
+    O((N + M) log(N + M)) for any M and any spacing of the evaluation points.
+    """
+
+    x = np.asarray(x, dtype=complex)
+    N = len(x)
+    if N == 0 or M <= 0:
+        return np.zeros(max(M, 0), dtype=complex)
+
+    L = fft_length(N + M - 1)
+
+    # W^(m² / 2) for m = -(N - 1) .. max(N, M) - 1, through the exact exponent of W
+    log_w = np.log(complex(W))
+    m = np.arange(-(N - 1), max(N, M))
+    chirp = np.exp(log_w * (m.astype(float) ** 2) / 2)
+
+    n = np.arange(N)
+    y = x * np.power(complex(A), -n) * chirp[N - 1 : 2 * N - 1]
+
+    v = np.zeros(L, dtype=complex)
+    v[: M + N - 1] = 1 / chirp[: M + N - 1]
+
+    out = np.fft.ifft(np.fft.fft(y, L) * np.fft.fft(v))
+    return out[N - 1 : N - 1 + M] * chirp[N - 1 : N - 1 + M]
+
+
+def goertzel(x, bins) -> np.ndarray:
+    """
+    DFT of x at the given (possibly fractional) bins: X[k] = sum_n x[n] * e^(-j2πkn/N)
+
+    Runs the Goertzel recurrence s[n] = x[n] + 2 cos(w) s[n - 1] - s[n - 2] of every bin side by
+    side. Its response to the samples of a block is a product with U_m = sin((m + 1) w) / sin(w),
+    and to the state before the block a combination of U_L and U_(L - 1); both are tabulated
+    once with the recurrence itself, so the scalar loop only runs over GOERTZEL_BLOCK_SIZE samples.
+    """
+
+    x = np.asarray(x, dtype=float)
+    N = len(x)
+    w = 2 * np.pi * np.asarray(bins, dtype=float) / max(N, 1)
+    coeff = 2 * np.cos(w)
+
+    # U[m + 1] = U_m for m = -1 .. L, U_-1 = 0 and U_0 = 1
+    L = min(N, GOERTZEL_BLOCK_SIZE)
+    U = np.zeros((L + 2, len(w)))
+    U[1] = 1.0
+    for m in range(2, L + 2):
+        U[m] = coeff * U[m - 1] - U[m - 2]
+
+    s1 = np.zeros(len(w))  # s[n - 1]
+    s2 = np.zeros(len(w))  # s[n - 2]
+    for start in range(0, N, GOERTZEL_BLOCK_SIZE):
+        block = x[start : start + GOERTZEL_BLOCK_SIZE]
+        n = len(block)
+        s1, s2 = (
+            block @ U[n:0:-1] + U[n + 1] * s1 - U[n] * s2,
+            block @ U[n - 1 :: -1] + U[n] * s1 - U[n - 1] * s2,
+        )
+
+    # X(k) = e^(-jwN) * (e^(jw) * s[N-1] - s[N-2]); the first factor is 1 for integer bins
+    return np.exp(-1j * w * N) * (np.exp(1j * w) * s1 - s2)
@@ -0,0 +1,77 @@
+"""
+Framing helpers
+
+Split a chunked stream of samples into overlapping fixed length frames.
+"""
+
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Frames transformed per FFT call, bounds the scratch memory of a transform step
+FRAMES_PER_BLOCK = 256
+
+
+class FrameBuffer:
+    """
+    Collects chunks and hands out every complete frame (frame_length samples, one every hop samples).
+    Only the samples that later frames still need are kept between chunks.
+    """
+
+    def __init__(self, frame_length: int, hop: int) -> None:
+        if frame_length <= 0 or hop <= 0:
+            raise ValueError("Frame length and hop must be positive")
+
+        self.frame_length = frame_length
+        self.hop = hop
+        self.frame_count = 0  # frames handed out so far
+        self.sample_count = 0  # samples pushed so far
+        self.__buffer = np.zeros(0)
+        self.__buffer_start = 0  # sample index of __buffer[0]
+
+    def push(self, chunk) -> np.ndarray:
+        """
+        Add samples and return the frames they complete, as a (frames, frame_length) array
+        """
+
+        chunk = np.asarray(chunk, dtype=float)
+        self.__buffer = np.concatenate([self.__buffer, chunk])
+        self.sample_count += len(chunk)
+
+        available = self.__buffer_start + len(self.__buffer)
+        if available < self.frame_length:
+            return np.zeros((0, self.frame_length))
+
+        return self.__take((available - self.frame_length) // self.hop + 1)
+
+    def flush(self) -> np.ndarray:
+        """
+        Zero pad the tail and return the frames needed to cover every pushed sample
+        """
+
+        if self.sample_count == 0:
+            return np.zeros((0, self.frame_length))
+
+        total = 1 + max(0, math.ceil((self.sample_count - self.frame_length) / self.hop))
+        needed = (total - 1) * self.hop + self.frame_length - self.__buffer_start
+        if needed > len(self.__buffer):
+            self.__buffer = np.concatenate([self.__buffer, np.zeros(needed - len(self.__buffer))])
+
+        return self.__take(total)
+
+    def __take(self, end: int) -> np.ndarray:
+        if end <= self.frame_count:
+            return np.zeros((0, self.frame_length))
+
+        offset = self.frame_count * self.hop - self.__buffer_start
+        frames = sliding_window_view(self.__buffer, self.frame_length)[offset :: self.hop]
+        frames = frames[: end - self.frame_count]
+        self.frame_count = end
+
+        # samples before the next frame are no longer needed
+        drop = min(self.frame_count * self.hop - self.__buffer_start, len(self.__buffer))
+        self.__buffer = self.__buffer[drop:]
+        self.__buffer_start += drop
+
+        return frames
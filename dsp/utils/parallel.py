@@ -0,0 +1,38 @@
+"""
+Thread pools shared by the vectorized kernels.
+
+numpy's convolution and FFT kernels release the GIL, so splitting their work across a thread pool
+uses several cores without the pickling cost of a process pool.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+# Number of threads used when the caller doesn't ask for a specific count
+workers = os.cpu_count() or 1
+
+_executors: Dict[int, ThreadPoolExecutor] = {}
+
+
+def set_workers(count: int | None):
+    """
+    Set the default thread count of the parallel kernels (None: one per CPU core)
+    """
+
+    global workers
+    workers = max(1, count or os.cpu_count() or 1)
+
+
+def get_workers(count: int | None = None) -> int:
+    return max(1, count or workers)
+
+
+def get_executor(count: int) -> ThreadPoolExecutor:
+    """
+    Shared thread pool with `count` threads, created on first use
+    """
+
+    if count not in _executors:
+        _executors[count] = ThreadPoolExecutor(count, thread_name_prefix="dsp-worker")
+    return _executors[count]
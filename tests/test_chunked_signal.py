@@ -0,0 +1,69 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from dsp.enums.signal_domain import SIGNAL_DOMAIN
+from dsp.models import ChunkedSignal, DigitalSignal, FrequencySignal, TimeSignal
+from tests.funcs.compareFreqDom import SignalComapreAmplitude
+from tests.funcs.compareSignals import SignalSamplesAreEqual
+
+
+class TestChunkedSignal(unittest.TestCase):
+    def test_two_pass_operations(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src = "data/task6/dc-component/"
+            signal = ChunkedSignal.read(f"{src}input-DC_component.txt", chunk_size=4, directory=tmp)
+
+            res = signal.remove_dc().to_signal()
+            self.assertTrue(
+                SignalSamplesAreEqual(f"{src}result-DC_component.txt", res["time"], res["amp"])
+            )
+
+            signal = ChunkedSignal.read("data/task2/input/sig1.txt", chunk_size=3, directory=tmp)
+            expected = DigitalSignal.read("data/task2/csum/result_sig1csum.txt")
+            self.assertTrue(expected.compare(signal.cumulative_sum().to_signal()))
+
+            signal = ChunkedSignal.read("data/task3/Quan2_input.txt", chunk_size=2, directory=tmp)
+            expected = TimeSignal.read("data/task3/Quan2_input.txt").quantize_w_levels(4)
+            res = signal.quantize_w_levels(4).to_signal()
+            for a, b in zip(res["amp"], expected[2]):
+                self.assertAlmostEqual(a, b)
+
+    def test_dft(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            signal = ChunkedSignal.read("data/task4/input.txt", chunk_size=2, directory=tmp)
+
+            spectrum = signal.switch_domain(4)
+            self.assertEqual(spectrum.signal_domain, SIGNAL_DOMAIN.FREQUENCY)
+
+            result = spectrum.to_signal()
+            expected = DigitalSignal.read("data/task4/result.txt")
+            assert isinstance(result, FrequencySignal)
+
+            self.assertTrue(SignalComapreAmplitude(result["amp"], expected["amp"]))
+
+            restored = spectrum.switch_domain().to_signal()
+            expected = DigitalSignal.read("data/task4/input.txt")
+            self.assertTrue(SignalComapreAmplitude(restored["amp"], expected["amp"]))
+
+    def test_four_step_dft(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            x = np.random.default_rng(6).standard_normal(360)
+            signal = TimeSignal(False, len(x), [list(range(len(x))), x.tolist()])
+            signal = ChunkedSignal.from_signal(signal, directory=tmp)
+
+            # 360 = 18 x 20, out of core with at most 24 samples in memory
+            spectrum = signal.switch_domain(memory_budget=24)
+            self.assertTrue(np.allclose(spectrum.memmap(), np.fft.fft(x)))
+            self.assertTrue(np.allclose(spectrum.switch_domain(memory_budget=24).memmap(), x))
+
+            # 2 x 181: one factor doesn't fit the budget
+            odd = TimeSignal(False, 362, [list(range(362)), [1.0] * 362])
+            odd = ChunkedSignal.from_signal(odd, directory=tmp)
+            with self.assertRaises(ValueError):
+                odd.switch_domain(memory_budget=24)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+
+from dsp.models import DigitalSignal, TimeSignal
+from dsp.utils.convolution import (
+    LinearPhaseConvolver,
+    PartitionedConvolver,
+    direct_convolve,
+    symmetry,
+)
+from tests.funcs.ConvTest import ConvTest
+
+
+class TestConvolution(unittest.TestCase):
+    def test_parallel_matches_serial(self):
+        rng = np.random.default_rng(0)
+        x = rng.standard_normal(200_000)
+        h = rng.standard_normal(64)
+
+        expected = np.convolve(x, h)
+        for workers in (1, 2, 3, 16):
+            self.assertTrue(np.allclose(direct_convolve(x, h, workers), expected))
+
+        # kernel longer than the signal
+        self.assertTrue(np.allclose(direct_convolve(h, x, 4), expected))
+
+    def test_time_signal_convolve(self):
+        src = "data/task6/convolution/"
+
+        signal1 = DigitalSignal.read(f"{src}input-conv_Sig1.txt")
+        signal2 = DigitalSignal.read(f"{src}input-conv_Sig2.txt")
+        assert isinstance(signal1, TimeSignal)
+        assert isinstance(signal2, TimeSignal)
+
+        output = signal1.convolve(signal2, workers=4)
+        self.assertTrue(ConvTest(output["time"], output["amp"]))
+
+    def test_linear_phase(self):
+        rng = np.random.default_rng(1)
+        half = rng.standard_normal(300)
+        symmetric = np.concatenate([half, [0.5], half[::-1]])
+        antisymmetric = np.concatenate([half, [0.0], -half[::-1]])
+        self.assertEqual(symmetry(symmetric), 1)
+        self.assertEqual(symmetry(antisymmetric), -1)
+        self.assertEqual(symmetry(half), 0)
+
+        # long enough for the FFT path, then chunk by chunk
+        x = rng.standard_normal(50_000)
+        for h in (symmetric, antisymmetric):
+            expected = np.convolve(x, h)
+            convolver = LinearPhaseConvolver(h)
+            self.assertTrue(np.allclose(convolver.convolve(x), expected))
+
+            chunks = [convolver.process(x[i : i + 8000]) for i in range(0, len(x), 8000)]
+            self.assertTrue(np.allclose(np.concatenate(chunks + [convolver.flush()]), expected))
+
+        with self.assertRaises(ValueError):
+            LinearPhaseConvolver(half)
+
+    def test_partitioned(self):
+        rng = np.random.default_rng(2)
+        x = rng.standard_normal(5000)
+
+        for taps in (1, 64, 65, 3000):
+            h = rng.standard_normal(taps)
+            convolver = PartitionedConvolver(h, block_size=64)
+
+            chunks = [convolver.process(x[i : i + 333]) for i in range(0, len(x), 333)]
+            # only whole blocks come out, at most one block behind the input
+            self.assertTrue(all(len(c) % 64 == 0 for c in chunks))
+            self.assertGreater(sum(map(len, chunks)), len(x) - 64)
+
+            out = np.concatenate(chunks + [convolver.flush()])
+            self.assertTrue(np.allclose(out, np.convolve(x, h)))
+
+
+if __name__ == "__main__":
+    unittest.main()
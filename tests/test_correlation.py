@@ -0,0 +1,120 @@
+import unittest
+
+import numpy as np
+
+from dsp.models import DelayEstimator, DigitalSignal, TemplateIndex, TimeSignal
+from dsp.utils.correlation import correlate_direct, correlate_range
+
+
+class TestCorrelation(unittest.TestCase):
+    src = "data/task6/correlation/"
+
+    def test_linear(self):
+        rng = np.random.default_rng(5)
+        x1 = rng.standard_normal(40)
+        x2 = rng.standard_normal(25)
+        sig1 = TimeSignal(False, len(x1), [list(range(len(x1))), x1.tolist()])
+        sig2 = TimeSignal(False, len(x2), [list(range(3, 3 + len(x2))), x2.tolist()])
+
+        res = sig1.correlate(sig2)
+
+        # np.correlate(x2, x1, "full") holds sum_n x1[n] x2[n + d] for d = -(len(x1) - 1) .. len(x2) - 1
+        expected = np.correlate(x2, x1, "full") / np.sqrt(np.dot(x1, x1) * np.dot(x2, x2))
+        self.assertTrue(np.allclose(res["amp"], expected))
+        self.assertEqual(res["time"][0], 3 - 39)
+        self.assertEqual(res["time"][-1], 3 + 24)
+
+    def test_modes(self):
+        signal1 = DigitalSignal.read(f"{self.src}input-signal1.txt")
+        signal2 = DigitalSignal.read(f"{self.src}input-signal2.txt")
+        assert isinstance(signal1, TimeSignal)
+        assert isinstance(signal2, TimeSignal)
+
+        circular = signal1.correlate(signal2)
+        linear = signal1.correlate(signal2, mode="linear")
+        self.assertEqual(len(circular), 5)
+        self.assertEqual(len(linear), 9)
+
+        # circular lag l is the sum of the linear lags l and l - N
+        for lag in range(1, 5):
+            self.assertAlmostEqual(circular["amp"][lag], linear["amp"][lag + 4] + linear["amp"][lag - 1])
+
+        with self.assertRaises(ValueError):
+            signal1.correlate(signal2, mode="full")  # type: ignore
+
+    def test_max_lag(self):
+        rng = np.random.default_rng(6)
+        x1 = rng.standard_normal(300)
+        x2 = rng.standard_normal(280)
+        sig1 = TimeSignal(False, len(x1), [list(range(len(x1))), x1.tolist()])
+        sig2 = TimeSignal(False, len(x2), [list(range(5, 5 + len(x2))), x2.tolist()])
+
+        full = sig1.correlate(sig2)
+        limited = sig1.correlate(sig2, max_lag=10)
+        self.assertEqual(limited["time"], list(range(-10, 11)))
+        start = full["time"].index(-10)
+        self.assertTrue(np.allclose(limited["amp"], full["amp"][start : start + 21]))
+
+        # a wide window takes the FFT path, it agrees with the direct one (also past the ends)
+        x1 = rng.standard_normal(3000)
+        x2 = rng.standard_normal(2000)
+        for circular in (False, True):
+            direct = correlate_direct(x1, x2, -3200, 3200, circular)
+            self.assertTrue(np.allclose(correlate_range(x1, x2, -3200, 3200, circular), direct))
+
+    def test_local_normalization(self):
+        x = np.sin(np.arange(200) / 7)
+        sig = TimeSignal(False, len(x), [list(range(len(x))), x.tolist()])
+        shifted = TimeSignal(False, 150, [list(range(150)), x[20:170].tolist()])
+
+        res = sig.correlate(shifted, max_lag=30, normalization="local")
+        peak = res["time"][int(np.argmax(res["amp"]))]
+        self.assertEqual(peak, -20)
+        self.assertAlmostEqual(max(res["amp"]), 1.0)
+
+        full = sig.correlate(shifted, normalization="local")
+        self.assertTrue(np.all(np.abs(full["amp"]) <= 1 + 1e-9))
+
+    def test_delay_estimation(self):
+        rng = np.random.default_rng(7)
+        ref = np.convolve(rng.standard_normal(400), np.hanning(9), "same")
+        freq = np.fft.rfftfreq(len(ref))
+
+        # fractional delays applied as a linear phase
+        delays = rng.uniform(-15, 15, 64)
+        pairs = [
+            (ref, np.fft.irfft(np.fft.rfft(ref) * np.exp(-2j * np.pi * freq * d), len(ref)))
+            for d in delays
+        ]
+
+        res = DelayEstimator(max_lag=20, workers=2).estimate(pairs)
+        self.assertEqual(res.shape, (64, 2))
+        self.assertTrue(np.allclose(res[:, 0], delays, atol=0.1))
+        self.assertTrue(np.all(res[:, 1] > 0.95))
+
+        # start times of TimeSignals are part of the delay
+        sig1 = TimeSignal(False, len(ref), [list(range(len(ref))), ref.tolist()])
+        sig2 = TimeSignal(False, len(ref), [list(range(10, 10 + len(ref))), ref.tolist()])
+        res = DelayEstimator().estimate([(sig1, sig2), (sig2, sig1)])
+        self.assertTrue(np.allclose(res, [[10, 1], [-10, 1]]))
+
+    def test_template_search(self):
+        rng = np.random.default_rng(8)
+        templates = [rng.standard_normal(rng.integers(20, 60)) for _ in range(100)]
+        x = 0.3 * rng.standard_normal(1000)
+        x[300 : 300 + len(templates[42])] += 2 * templates[42]
+        x[700 : 700 + len(templates[7])] += templates[7]
+        signal = TimeSignal(False, len(x), [list(range(50, 50 + len(x))), x.tolist()])
+
+        index = TemplateIndex(templates)
+        hits = index.search(signal, top_k=2)
+        self.assertEqual([(i, lag) for i, lag, _ in hits], [(42, 350), (7, 750)])
+
+        # scores match the locally normalized correlation of the template alone
+        template = TimeSignal(False, len(templates[7]), [list(range(len(templates[7]))), templates[7].tolist()])
+        expected = template.correlate(signal, max_lag=750, normalization="local")["amp"][-1]
+        self.assertAlmostEqual(hits[1][2], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,17 @@
 import unittest
 
+import numpy as np
+
 from dsp.enums.filter_type import FILTER_TYPE
-from dsp.models import DigitalSignal, FrequencySignal, TimeSignal
+from dsp.models import (
+    DesignSweep,
+    DigitalSignal,
+    FilterBank,
+    FilterCascade,
+    FrequencySignal,
+    IirFilter,
+    TimeSignal,
+)
 from dsp.models.Filter import FirFilter
 from tests.funcs.compareSignals import Compare_Signals
 
@@ -109,3 +119,170 @@ class TestFirFilters(unittest.TestCase):
         self.assertTrue(
             Compare_Signals(f"{self.src}Testcase 8/ecg_band_stop_filtered.txt", res["time"], res["amp"])
         )
+
+    def test_filter_bank(self):
+        # Testcases 6 and 8 filter the same signal with the band pass / band stop pair
+        spec = dict(sampling_frequency=1000, stopband_attenuation=60, lowcutoff=150, highcutoff=250, transition_band=50)
+        bank = FilterBank([
+            FirFilter(filter_type=FILTER_TYPE.BAND_PASS, **spec),
+            FirFilter(filter_type=FILTER_TYPE.BAND_STOP, **spec),
+        ], block_size=64)
+
+        signal = DigitalSignal.read(f"{self.src}Testcase 6/ecg400.txt")
+        assert isinstance(signal, TimeSignal)
+
+        band_pass, band_stop = bank.apply(signal)
+        self.assertTrue(
+            Compare_Signals(f"{self.src}Testcase 6/ecg_band_pass_filtered.txt", band_pass["time"], band_pass["amp"])
+        )
+        self.assertTrue(
+            Compare_Signals(f"{self.src}Testcase 8/ecg_band_stop_filtered.txt", band_stop["time"], band_stop["amp"])
+        )
+
+        energy = bank.apply(signal, energy_only=True)
+        self.assertTrue(np.allclose(energy, [np.dot(r["amp"], r["amp"]) for r in (band_pass, band_stop)]))
+
+    def test_window_tables(self):
+        window = FirFilter.find_window("Blackman")
+        table = window.samples(101)
+
+        # computed once per N, and shared read-only
+        self.assertIs(window.samples(101), table)
+        self.assertFalse(table.flags.writeable)
+        self.assertAlmostEqual(table[50], 1.0)
+        self.assertTrue(np.allclose(table, table[::-1]))
+        self.assertTrue(np.all(FirFilter.find_window("Rectangular").samples(5) == 1))
+
+    def test_kaiser(self):
+        spec = dict(filter_type=FILTER_TYPE.LOW_PASS, cutoff=1500, sampling_frequency=8000, transition_band=500)
+
+        # 54 dB takes a Blackman window from the table
+        table = FirFilter(stopband_attenuation=54, **spec)
+        kaiser = FirFilter(stopband_attenuation=54, window="Kaiser", **spec)
+        self.assertEqual(table.window.name, "Blackman")
+        self.assertEqual(kaiser.coefficient_count, 53)
+        self.assertEqual(kaiser.tap_savings(), table.coefficient_count - 53)
+
+        # the spec is still met: passband up to 1500 Hz, stopband from 2000 Hz
+        response = np.abs(np.fft.rfft(kaiser.coefficients, 1 << 14))
+        freq = np.fft.rfftfreq(1 << 14, 1 / 8000)
+        self.assertGreaterEqual(-20 * np.log10(response[freq >= 2000].max()), 54)
+        self.assertTrue(np.allclose(response[freq <= 1500], 1, atol=0.01))
+
+        with self.assertRaises(ValueError):
+            FirFilter(stopband_attenuation=54, window="Hanning", **spec)
+
+    def test_frequency_domain_apply(self):
+        fil = FirFilter(FILTER_TYPE.LOW_PASS, 1000, 50, 100, cutoff=100)
+        K = fil.coefficient_count
+        m = (K - 1) // 2
+
+        signal = DigitalSignal.read(f"{self.src}Testcase 2/ecg400.txt")
+        assert isinstance(signal, TimeSignal)
+        signal = TimeSignal(False, 150, [signal["time"][:150], signal["amp"][:150]])
+
+        # zero padded by K - 1 samples, the circular result holds the whole linear one
+        N = len(signal) + K - 1
+        padded = TimeSignal(False, N, [list(range(N)), signal["amp"] + [0.0] * (K - 1)])
+        res = padded.switch_domain().apply(fil).switch_domain()
+
+        expected = fil.apply(signal)
+        amp = res["amp"][N - m :] + res["amp"][: N - m]
+        self.assertTrue(np.allclose(amp, expected["amp"]))
+
+        self.assertIs(fil.spectrum(N), fil.spectrum(N))
+
+        # shorter than the filter: time aliased, i.e. the response sampled at the n DFT frequencies
+        n = K - 5
+        dtft = np.exp(-2j * np.pi * np.outer(np.arange(n), np.arange(-m, m + 1)) / n) @ fil.coefficients
+        self.assertTrue(np.allclose(fil.spectrum(n), dtft))
+
+        with self.assertRaises(TypeError):
+            padded.switch_domain().apply(IirFilter(FILTER_TYPE.LOW_PASS, 1000, 50, 100, cutoff=100))
+
+    def test_cascade(self):
+        low_pass = FirFilter(FILTER_TYPE.LOW_PASS, 1000, 60, 50, cutoff=300)
+        band_stop = FirFilter(FILTER_TYPE.BAND_STOP, 1000, 60, 50, lowcutoff=150, highcutoff=250)
+        smoothing = TimeSignal(False, 3, [[0, 1, 2], [0.25, 0.5, 0.25]])
+        cascade = FilterCascade([low_pass, band_stop, smoothing])
+
+        signal = DigitalSignal.read(f"{self.src}Testcase 2/ecg400.txt")
+        assert isinstance(signal, TimeSignal)
+
+        self.assertTrue(cascade.should_fuse(len(signal)))
+        res = cascade.apply(signal)
+        expected = band_stop.apply(low_pass.apply(signal)).convolve(smoothing)
+        self.assertTrue(np.allclose(res["amp"], expected["amp"]))
+        self.assertEqual(res["time"][0], -(low_pass.coefficient_count // 2) - (band_stop.coefficient_count // 2))
+        self.assertEqual(len(cascade.coefficients), cascade.coefficient_count)
+
+        # fusing two long filters up front doesn't pay off for a short signal
+        long_filter = FirFilter(FILTER_TYPE.LOW_PASS, 1000, 60, 0.5, cutoff=300)
+        self.assertFalse(FilterCascade([long_filter, long_filter]).should_fuse(100))
+
+    def test_frequency_response(self):
+        fil = FirFilter(FILTER_TYPE.LOW_PASS, 8000, 50, 500, cutoff=1500)
+
+        res = fil.frequency_response(601)
+        self.assertEqual(res["freq"][-1], 4000)
+        self.assertTrue(np.allclose(res.harmonics, np.fft.rfft(fil.coefficients, 1200)))
+
+        # a grid coarser than the filter still samples the true response
+        coarse = fil.frequency_response(5)
+        self.assertTrue(np.allclose(coarse.harmonics, np.array(res.harmonics)[::150]))
+
+        # the IIR design answers on the same grid
+        iir = IirFilter(FILTER_TYPE.LOW_PASS, 8000, 50, 500, cutoff=1500).frequency_response(601)
+        self.assertTrue(np.allclose(iir["freq"], res["freq"]))
+
+    def test_verify(self):
+        spec = dict(sampling_frequency=8000, transition_band=500, lowcutoff=1500, highcutoff=2500)
+        for filter_type in (FILTER_TYPE.BAND_PASS, FILTER_TYPE.BAND_STOP):
+            report = FirFilter(filter_type, stopband_attenuation=60, **spec).verify()
+            self.assertTrue(report.meets_spec)
+            self.assertGreaterEqual(report.stopband_attenuation, 60)
+            self.assertLessEqual(report.transition_width, 500 + 1)
+            self.assertLess(report.passband_ripple, 0.01)
+
+            self.assertFalse(FirFilter(filter_type, stopband_attenuation=60, **spec).verify(max_passband_ripple=1e-4).meets_spec)
+
+        # the rectangular window falls just short of its table attenuation
+        report = FirFilter(FILTER_TYPE.LOW_PASS, 8000, 20, 500, cutoff=1500).verify()
+        self.assertFalse(report.meets_spec)
+        self.assertLess(report.stopband_attenuation, 20)
+
+        # lower stopband below 0 Hz: left out, the upper one is still measured
+        fil = FirFilter(FILTER_TYPE.BAND_PASS, 8000, 50, 500, lowcutoff=300, highcutoff=1500)
+        self.assertEqual(fil.bands()[1], [(0.25, 0.5)])
+        self.assertLessEqual(fil.verify().transition_width, 500 + 1)
+
+        # stopband entirely outside 0 .. fs / 2: nothing to measure
+        with self.assertRaises(ValueError):
+            FirFilter(FILTER_TYPE.HIGH_PASS, 8000, 50, 500, cutoff=300).verify()
+        with self.assertRaises(ValueError):
+            FirFilter(FILTER_TYPE.LOW_PASS, 8000, 50, 500, cutoff=3800).verify()
+
+    def test_design_sweep(self):
+        base = {"filter_type": "LOW_PASS", "sampling_frequency": 8000, "cutoff": 1500}
+        specs = DesignSweep.grid(
+            base, window=[None, "Kaiser", "Hanning"], stopband_attenuation=[40, 50], transition_band=[300, 500]
+        )
+        self.assertEqual(len(specs), 12)
+
+        res = DesignSweep(specs, min_attenuation=50, max_transition=500).run(100_000, workers=2)
+
+        self.assertTrue(res)
+        self.assertTrue(all(c.report.stopband_attenuation >= 50 and c.report.meets_spec for c in res))
+        self.assertEqual([c.taps for c in res], sorted(c.taps for c in res))
+        # a Kaiser window designed for the requirement is the cheapest
+        self.assertEqual(res[0].window, "Kaiser")
+        self.assertEqual(res[0].spec["transition_band"], 500)
+
+        # a spec whose stopband lies below 0 Hz is dropped, not fatal
+        specs = DesignSweep.grid(
+            {**base, "filter_type": "HIGH_PASS", "stopband_attenuation": 50},
+            cutoff=[300, 1500],
+            transition_band=[500],
+        )
+        res = DesignSweep(specs).run(100_000, workers=1)
+        self.assertEqual([c.spec["cutoff"] for c in res], [1500])
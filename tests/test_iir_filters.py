@@ -0,0 +1,84 @@
+import unittest
+
+import numpy as np
+
+from dsp.enums.filter_type import FILTER_TYPE
+from dsp.models import IirFilter, Pipeline, SignalStream, TimeSignal
+
+
+class TestIirFilters(unittest.TestCase):
+    cases = [
+        (FILTER_TYPE.LOW_PASS, {"cutoff": 1500}, lambda f: f <= 1500, lambda f: f >= 1800),
+        (FILTER_TYPE.HIGH_PASS, {"cutoff": 1500}, lambda f: f >= 1500, lambda f: f <= 1200),
+        (
+            FILTER_TYPE.BAND_PASS, {"lowcutoff": 1500, "highcutoff": 2500},
+            lambda f: (f >= 1500) & (f <= 2500), lambda f: (f <= 1200) | (f >= 2800),
+        ),
+        (
+            FILTER_TYPE.BAND_STOP, {"lowcutoff": 1500, "highcutoff": 2500},
+            lambda f: (f <= 1500) | (f >= 2500), lambda f: (f >= 1800) & (f <= 2200),
+        ),
+    ]
+
+    def test_meets_spec(self):
+        for design in ("butterworth", "chebyshev"):
+            for filter_type, cutoffs, passband, stopband in self.cases:
+                fil = IirFilter(filter_type, 8000, 50, 300, design=design, **cutoffs)
+                response = fil.frequency_response(8001)
+                freq = np.asarray(response["freq"])
+                with np.errstate(divide="ignore"):
+                    gain = 20 * np.log10(np.asarray(response["amp"]))
+
+                self.assertGreaterEqual(gain[passband(freq)].min(), -1 - 1e-6)
+                self.assertLessEqual(gain[passband(freq)].max(), 1e-6)
+                self.assertLessEqual(gain[stopband(freq)].max(), -50)
+
+    def test_apply_and_stream(self):
+        fil = IirFilter(FILTER_TYPE.LOW_PASS, 1000, 60, 50, cutoff=100, design="chebyshev")
+
+        rng = np.random.default_rng(0)
+        x = rng.standard_normal(3000)
+        signal = TimeSignal(False, len(x), [list(range(-10, len(x) - 10)), x.tolist()])
+
+        res = fil.apply(signal)
+        self.assertEqual(res["time"], signal["time"])
+
+        # direct form recursion, one sample at a time
+        expected = x.copy()
+        for b0, b1, b2, _, a1, a2 in fil.sos:
+            y = np.zeros(len(x))
+            for n in range(len(x)):
+                y[n] = b0 * expected[n] - a1 * y[n - 1] * (n > 0) - a2 * y[n - 2] * (n > 1)
+                y[n] += b1 * expected[n - 1] * (n > 0) + b2 * expected[n - 2] * (n > 1)
+            expected = y
+        self.assertTrue(np.allclose(res["amp"], expected))
+
+        stream = fil.stream()
+        chunks = [stream.process(x[i : i + 101]) for i in range(0, len(x), 101)]
+        self.assertTrue(np.allclose(np.concatenate(chunks), expected))
+
+        streamed = SignalStream.from_signal(signal, chunk_size=101).apply(fil).to_signal()
+        self.assertEqual(streamed["time"], signal["time"])
+        self.assertTrue(np.allclose(streamed["amp"], expected))
+
+        spec = {
+            "op": "filter",
+            "filter_type": "LOW_PASS",
+            "sampling_frequency": 1000,
+            "stopband_attenuation": 60,
+            "transition_band": 50,
+            "cutoff": 100,
+            "design": "chebyshev",
+        }
+        res = Pipeline([spec], chunk_size=64).build(SignalStream.from_signal(signal)).to_signal()
+        self.assertTrue(np.allclose(res["amp"], expected))
+
+    def test_invalid_spec(self):
+        with self.assertRaises(ValueError):
+            IirFilter(FILTER_TYPE.LOW_PASS, 1000, 60, 50, cutoff=480)
+        with self.assertRaises(ValueError):
+            IirFilter(FILTER_TYPE.BAND_STOP, 1000, 60, 50, lowcutoff=100, highcutoff=150)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+
+from dsp.enums.filter_type import FILTER_TYPE
+from dsp.models import DigitalSignal, Pipeline, SignalStream, TimeSignal
+from dsp.models.Filter import FirFilter
+from tests.funcs.compareSignals import Compare_Signals, SignalSamplesAreEqual
+
+
+class TestPipeline(unittest.TestCase):
+    src = "data/task7/"
+
+    low_pass = {
+        "filter_type": "LOW_PASS",
+        "cutoff": 1500,
+        "sampling_frequency": 8000,
+        "stopband_attenuation": 50,
+        "transition_band": 500,
+    }
+
+    def test_filter_stream(self):
+        # small chunks so the filter tail crosses many chunk boundaries
+        pipeline = Pipeline.from_spec({
+            "chunk_size": 7,
+            "stages": [{"op": "filter", **self.low_pass}],
+        })
+
+        res = pipeline.run(f"{self.src}FIR test cases/Testcase 2/ecg400.txt")
+        assert isinstance(res, TimeSignal)
+
+        self.assertTrue(
+            Compare_Signals(f"{self.src}FIR test cases/Testcase 2/ecg_low_pass_filtered.txt", res["time"], res["amp"])
+        )
+
+    def test_partitioned_filter_stream(self):
+        pipeline = Pipeline.from_spec({
+            "chunk_size": 100,
+            "stages": [{"op": "filter", "block_size": 16, **self.low_pass}],
+        })
+
+        res = pipeline.run(f"{self.src}FIR test cases/Testcase 2/ecg400.txt")
+        assert isinstance(res, TimeSignal)
+
+        self.assertTrue(
+            Compare_Signals(f"{self.src}FIR test cases/Testcase 2/ecg_low_pass_filtered.txt", res["time"], res["amp"])
+        )
+
+    def test_resample_to_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "out.txt")
+            pipeline = Pipeline.from_spec({
+                "chunk_size": 50,
+                "stages": [
+                    {"op": "read", "path": f"{self.src}Sampling test cases/Testcase 3/ecg400.txt"},
+                    {"op": "resample", "m": 2, "L": 3, "filter": self.low_pass},
+                    {"op": "save", "path": out},
+                ],
+            })
+            pipeline.run()
+
+            res = DigitalSignal.read(out)
+            self.assertEqual(res.sample_count, 625)
+            self.assertTrue(
+                Compare_Signals(f"{self.src}Sampling test cases/Testcase 3/Sampling_Up_Down.txt", res["time"], res["amp"])
+            )
+
+    def test_stats_stages(self):
+        signal = DigitalSignal.read("data/task6/dc-component/input-DC_component.txt")
+        assert isinstance(signal, TimeSignal)
+
+        res = SignalStream.from_signal(signal, 3).remove_dc().to_signal()
+        self.assertTrue(
+            SignalSamplesAreEqual("data/task6/dc-component/result-DC_component.txt", res["time"], res["amp"])
+        )
+
+        signal = DigitalSignal.read("data/task3/Quan2_input.txt")
+        assert isinstance(signal, TimeSignal)
+
+        expected = signal.quantize_w_levels(4)
+        res = Pipeline([{"op": "quantize", "levels": 4}], chunk_size=2).run(signal)
+        assert isinstance(res, TimeSignal)
+        for a, b in zip(res["amp"], expected[2]):
+            self.assertAlmostEqual(a, b)
+
+    def test_unknown_stage(self):
+        with self.assertRaises(ValueError):
+            Pipeline.from_spec({"stages": [{"op": "fourier"}]})
+
+
+if __name__ == "__main__":
+    unittest.main()
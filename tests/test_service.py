@@ -0,0 +1,97 @@
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import unittest
+
+from dsp.models import DigitalSignal, TimeSignal
+from dsp.service import ProcessingService
+from tests.funcs.compareSignals import Compare_Signals
+
+
+class TestService(unittest.TestCase):
+    src = "data/task7/FIR test cases/"
+
+    low_pass = {
+        "filter_type": "LOW_PASS",
+        "cutoff": 1500,
+        "sampling_frequency": 8000,
+        "stopband_attenuation": 50,
+        "transition_band": 500,
+    }
+
+    def test_batched_filter(self):
+        signal = DigitalSignal.read(f"{self.src}Testcase 2/ecg400.txt")
+        assert isinstance(signal, TimeSignal)
+
+        async def run():
+            service = ProcessingService(batch_delay=0.05)
+            results = await asyncio.gather(*[
+                service.submit("filter", signal["amp"], 0, self.low_pass) for _ in range(8)
+            ])
+            return service, results
+
+        service, results = asyncio.run(run())
+
+        # all 8 same-length requests ran as a single batch
+        self.assertEqual(service.batches_run, 1)
+        for amp, start in results:
+            self.assertTrue(Compare_Signals(
+                f"{self.src}Testcase 2/ecg_low_pass_filtered.txt",
+                list(range(start, start + len(amp))),
+                amp,
+            ))
+
+    def test_invalid_request_fails_alone(self):
+        async def run():
+            service = ProcessingService(batch_delay=0.05)
+            return await asyncio.gather(
+                service.submit("remove_dc", [1, 2, 3]),
+                service.submit("remove_dc", [1, "x", 3]),
+                service.submit("remove_dc", [1, float("nan"), 3]),
+                return_exceptions=True,
+            )
+
+        valid, text, nan = asyncio.run(run())
+        self.assertEqual(valid[0].tolist(), [-1.0, 0.0, 1.0])
+        self.assertIsInstance(text, ValueError)
+        self.assertIsInstance(nan, ValueError)
+
+    def test_socket(self):
+        async def run(path):
+            service = ProcessingService()
+            await service.start(path)
+
+            reader, writer = await asyncio.open_unix_connection(path)
+            requests = [
+                {"id": 1, "op": "remove_dc", "amp": [1, 2, 3]},
+                {"id": 2, "op": "smooth", "amp": [1, 2, 3, 4], "params": {"window_size": 2}},
+                {"id": 3, "op": "fourier", "amp": [1]},
+            ]
+            for request in requests:
+                writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+
+            responses = [json.loads(await reader.readline()) for _ in requests]
+            writer.close()
+            await service.stop()
+            return {r["id"]: r for r in responses}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "dsp.sock")
+            # left behind by a server that didn't shut down
+            stale = socket.socket(socket.AF_UNIX)
+            stale.bind(path)
+            stale.close()
+
+            responses = asyncio.run(run(path))
+            self.assertFalse(os.path.exists(path))
+
+        self.assertEqual(responses[1]["amp"], [-1.0, 0.0, 1.0])
+        self.assertEqual(responses[2]["amp"], [1.5, 2.5, 3.5])
+        self.assertIn("error", responses[3])
+
+
+if __name__ == "__main__":
+    unittest.main()
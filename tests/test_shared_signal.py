@@ -0,0 +1,57 @@
+import multiprocessing
+import os
+import unittest
+from multiprocessing import shared_memory
+
+from dsp.models import DigitalSignal, SharedSignal, TimeSignal
+from dsp.models.SharedSignal import SharedSignalDescriptor
+from tests.funcs.compareSignals import SignalSamplesAreEqual
+
+
+def remove_dc_worker(args: "tuple[SharedSignalDescriptor, SharedSignalDescriptor]"):
+    source, destination = args
+    with SharedSignal.attach(source) as x, SharedSignal.attach(destination) as y:
+        y.amp[:] = x.amp - x.amp.mean()
+
+
+def crashing_worker(descriptor: SharedSignalDescriptor):
+    signal = SharedSignal.attach(descriptor)
+    signal.amp[0] = 42.0
+    os._exit(1)
+
+
+class TestSharedSignal(unittest.TestCase):
+    src = "data/task6/dc-component/"
+
+    def test_worker_hand_off(self):
+        signal = DigitalSignal.read(f"{self.src}input-DC_component.txt")
+        assert isinstance(signal, TimeSignal)
+
+        with SharedSignal.from_signal(signal) as x, SharedSignal.create(len(x), x.start_time) as y:
+            with multiprocessing.Pool(2) as pool:
+                pool.map(remove_dc_worker, [(x.descriptor, y.descriptor)])
+
+            res = y.to_signal()
+
+        self.assertTrue(
+            SignalSamplesAreEqual(f"{self.src}result-DC_component.txt", res["time"], res["amp"])
+        )
+
+    def test_worker_crash_does_not_leak(self):
+        shared = SharedSignal.create(4)
+        name = shared.descriptor.name
+
+        process = multiprocessing.Process(target=crashing_worker, args=(shared.descriptor,))
+        process.start()
+        process.join()
+
+        self.assertNotEqual(process.exitcode, 0)
+        self.assertEqual(shared.amp[0], 42.0)
+
+        shared.close()
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name)
+
+
+if __name__ == "__main__":
+    unittest.main()
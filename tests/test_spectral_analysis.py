@@ -0,0 +1,163 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from dsp.models import DigitalSignal, FrequencySignal, SignalStream, SlidingDFT, Spectrogram, TimeSignal, WelchEstimator
+
+
+class TestSpectralAnalysis(unittest.TestCase):
+    src = "data/task4/"
+
+    def test_goertzel(self):
+        signal = DigitalSignal.read(self.src + "input.txt")
+        assert isinstance(signal, TimeSignal)
+
+        expected = signal.switch_domain(4)
+        assert isinstance(expected, FrequencySignal) and expected.harmonics is not None
+
+        res = signal.goertzel(bins=[0, 3, 5], sampling_freq=4)
+        self.assertEqual(res.sample_count, 3)
+        self.assertEqual(res.bins, [0, 3, 5])
+        for i, k in enumerate([0, 3, 5]):
+            self.assertAlmostEqual(res.harmonics[i], expected.harmonics[k])  # type: ignore
+            self.assertAlmostEqual(res["freq"][i], k * 4 / 8)
+
+        # 1 Hz at 4 Hz sampling over 8 samples is bin 2
+        res = signal.goertzel(frequencies=[1], sampling_freq=4)
+        self.assertEqual(res.bins, [2])
+        self.assertAlmostEqual(res.harmonics[0], expected.harmonics[2])  # type: ignore
+
+    def test_goertzel_fractional_bin(self):
+        x = np.random.default_rng(2).standard_normal(50)
+        signal = TimeSignal(False, len(x), [list(range(len(x))), x.tolist()])
+
+        res = signal.goertzel(bins=[2.5])
+        expected = np.sum(x * np.exp(-2j * np.pi * 2.5 * np.arange(len(x)) / len(x)))
+        self.assertAlmostEqual(res.harmonics[0], expected)  # type: ignore
+
+        # longer than one block of the recurrence
+        y = np.random.default_rng(5).standard_normal(3000)
+        long = TimeSignal(False, len(y), [list(range(len(y))), y.tolist()])
+        res = long.goertzel(bins=[0, 7, 1234.5, 1500])
+        expected_long = np.exp(-2j * np.pi * np.outer([0, 7, 1234.5, 1500], np.arange(len(y))) / len(y)) @ y
+        self.assertTrue(np.allclose(res.harmonics, expected_long))
+
+        # labelled with the frequency evaluated, in Hz
+        res = signal.goertzel(frequencies=[12.5, 20], sampling_freq=250)
+        self.assertEqual(res.bins, [2.5, 4])
+        self.assertEqual(res["freq"], [12.5, 20])
+        self.assertAlmostEqual(res.harmonics[0], expected)  # type: ignore
+
+    def test_sliding_dft(self):
+        x = np.random.default_rng(3).standard_normal(500)
+        N = 32
+        window = TimeSignal(False, N, [list(range(N)), x[:N].tolist()])
+
+        sdft = SlidingDFT(window, reanchor_interval=100)
+        partial = SlidingDFT(window, bins=[1, 4])
+
+        for i in range(N, 200):
+            sdft.push(x[i])
+        sdft.update(x[200:203])  # short enough to rotate, not recompute
+        sdft.update(x[203:])
+        partial.update(x[N:])
+
+        expected = np.fft.fft(x[-N:])
+        self.assertTrue(np.allclose(sdft.harmonics, expected))
+        self.assertTrue(np.allclose(partial.harmonics, expected[[1, 4]]))
+
+        spectrum = partial.spectrum()
+        self.assertEqual(spectrum.bins, [1, 4])
+        self.assertEqual(sdft.spectrum().sample_count, N)
+        self.assertTrue(np.allclose(sdft.window()["amp"], x[-N:]))
+
+    def test_stft_round_trip(self):
+        signal = DigitalSignal.read("data/task7/FIR test cases/Testcase 2/ecg400.txt")
+        assert isinstance(signal, TimeSignal)
+
+        spectrogram = signal.stft(64, hop=16, window="Hamming", fft_size=128, sampling_freq=8000)
+        self.assertEqual(spectrogram.data.shape, (22, 65))
+
+        # every frame is the windowed slice of the (zero padded) signal
+        x = np.concatenate([signal["amp"], np.zeros(64)])
+        self.assertTrue(np.allclose(
+            spectrogram.data[3], np.fft.rfft(x[48:112] * spectrogram.window, 128)
+        ))
+
+        self.assertTrue(np.allclose(spectrogram.frame(3)["freq"], spectrogram.freq))
+        self.assertAlmostEqual(spectrogram.frame(3)["freq"][1], 8000 / 128)
+        self.assertAlmostEqual(spectrogram.times[3], 48 / 8000)
+
+        # without a sampling frequency, bins and samples
+        unscaled = signal.stft(64, hop=16, fft_size=128)
+        self.assertEqual(unscaled.times[3], 48)
+        self.assertEqual(unscaled.frame(3)["freq"][5], 5)
+
+        restored = spectrogram.istft()
+        self.assertEqual(restored["time"], signal["time"])
+        self.assertTrue(np.allclose(restored["amp"], signal["amp"]))
+
+    def test_stft_memmap(self):
+        signal = DigitalSignal.read("data/task7/FIR test cases/Testcase 2/ecg400.txt")
+        assert isinstance(signal, TimeSignal)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "spectrogram.npy")
+            stream = SignalStream.from_signal(signal, chunk_size=10)
+            spectrogram = Spectrogram.from_stream(stream, 50, 25, out_path=path)
+
+            stored = np.load(path, mmap_mode="r")
+            self.assertTrue(np.allclose(stored, signal.stft(50, 25).data))
+            self.assertEqual(spectrogram.frame(2).sample_count, 26)
+            del stored, spectrogram
+
+    def test_welch(self):
+        fs = 1000
+        n = np.arange(20000)
+        rng = np.random.default_rng(4)
+        x = np.sin(2 * np.pi * 125 * n / fs) + rng.standard_normal(len(n))
+        signal = TimeSignal(False, len(x), [n.tolist(), x.tolist()])
+
+        psd = signal.welch(256, sampling_freq=fs)
+        self.assertEqual(psd.sample_count, 129)
+        self.assertAlmostEqual(psd["freq"][32], 125)
+        self.assertEqual(int(np.argmax(psd["amp"])), 32)
+
+        # the noise floor of unit variance white noise is 2 / fs per Hz (one-sided)
+        floor = np.median(psd["amp"])
+        self.assertAlmostEqual(floor * fs / 2, 1, delta=0.15)
+
+        # streaming in small chunks gives the same estimate
+        estimator = WelchEstimator(256, sampling_freq=fs)
+        for i in range(0, len(x), 1000):
+            estimator.update(x[i : i + 1000])
+        self.assertTrue(np.allclose(estimator.psd, psd["amp"]))
+
+    def test_zoom_fft(self):
+        fs = 1000
+        n = np.arange(1000)
+        x = np.sin(2 * np.pi * 100.0 * n / fs) + np.sin(2 * np.pi * 100.6 * n / fs)
+        signal = TimeSignal(False, len(x), [n.tolist(), x.tolist()])
+
+        res = signal.zoom_fft(99, 102, 301, sampling_freq=fs)
+        self.assertEqual(res.sample_count, 301)
+        self.assertAlmostEqual(res.bins[0], 99)  # type: ignore
+        self.assertAlmostEqual(res.bins[-1], 102)  # type: ignore
+
+        # same values as the DFT evaluated directly at those frequencies
+        f = 99 + 0.01 * np.arange(301)
+        expected = np.exp(-2j * np.pi * np.outer(f, n) / fs) @ x
+        self.assertTrue(np.allclose(res.harmonics, expected))
+
+        # the freq axis holds the evaluated frequencies: a 100.3 Hz tone peaks at 100.3
+        self.assertAlmostEqual(res["freq"][0], 99)
+        self.assertAlmostEqual(res["freq"][-1], 102)
+        tone = np.sin(2 * np.pi * 100.3 * n / fs)
+        res = TimeSignal(False, len(n), [n.tolist(), tone.tolist()]).zoom_fft(99, 102, 301, sampling_freq=fs)
+        self.assertAlmostEqual(res["freq"][int(np.argmax(res["amp"]))], 100.3)
+
+
+if __name__ == "__main__":
+    unittest.main()
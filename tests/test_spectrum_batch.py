@@ -0,0 +1,37 @@
+import unittest
+
+import numpy as np
+
+from dsp.models import DigitalSignal, FrequencySignal, SpectrumBatch, TimeSignal
+from tests.funcs.compareFreqDom import SignalComapreAmplitude
+
+
+class TestSpectrumBatch(unittest.TestCase):
+    src = "data/task4/"
+
+    def test_matches_switch_domain(self):
+        signal = DigitalSignal.read(self.src + "input.txt")
+        assert isinstance(signal, TimeSignal)
+
+        batch = SpectrumBatch.transform([signal, signal * 2], sampling_freq=4)
+        expected = signal.switch_domain(4)
+        assert isinstance(expected, FrequencySignal)
+
+        self.assertEqual(len(batch), 2)
+        self.assertTrue(SignalComapreAmplitude(batch[0]["amp"], expected["amp"]))
+        self.assertTrue(SignalComapreAmplitude(batch[1]["amp"], [2 * a for a in expected["amp"]]))
+        self.assertTrue(SignalComapreAmplitude(batch[0]["freq"], expected["freq"]))
+
+    def test_parallel_array(self):
+        windows = np.random.default_rng(1).standard_normal((300, 64))
+
+        batch = SpectrumBatch.transform(windows, workers=4)
+        self.assertTrue(np.allclose(batch.harmonics, np.fft.fft(windows, axis=1)))
+        self.assertTrue(np.allclose(batch.amp, np.abs(batch.harmonics)))
+
+        with self.assertRaises(ValueError):
+            SpectrumBatch.transform([TimeSignal(False, 1, [[0], [1.0]]), TimeSignal(False, 2, [[0, 1], [1.0, 2.0]])])
+
+
+if __name__ == "__main__":
+    unittest.main()
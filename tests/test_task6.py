@@ -93,8 +93,6 @@ class TestTask5(unittest.TestCase):
 
         output.save(f"{src}output.txt")
 
-        # print("Correlation: ", output["amp"])
-
-        # self.assertTrue(
-        #     SignalSamplesAreEqual(f"{src}result.txt", output["time"], output["amp"])
-        # )
+        self.assertTrue(
+            SignalSamplesAreEqual(f"{src}result.txt", output["time"], output["amp"])
+        )